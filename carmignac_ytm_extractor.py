@@ -12,6 +12,37 @@ from datetime import datetime
 import re
 from typing import Dict, Optional
 
+from ytm_dashboard.extractors._modals import handle_modals
+
+# Any YTM label (English or French) followed, within the same text run, by a percentage
+_YTM_HTML_RE = re.compile(
+    r'(?:Yield to Maturity|Rendement à maturité|YTM)[^<]{0,200}?([0-9]+[.,][0-9]+)\s*%',
+    re.IGNORECASE | re.DOTALL
+)
+
+# Text of every rendered element containing a '%' whose grandparent mentions
+# one of the search terms, in document order
+_PERCENT_CANDIDATES_JS = """(terms) => {
+    const needles = terms.map((t) => t.toLowerCase());
+    // Like the old text=/%/ locator, skip text that is never rendered
+    const skipped = new Set(['SCRIPT', 'STYLE', 'NOSCRIPT']);
+    const out = [];
+    const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT);
+    let node;
+    while ((node = walker.nextNode())) {
+        if (!node.nodeValue.includes('%')) continue;
+        const elem = node.parentElement;
+        if (!elem || skipped.has(elem.tagName)) continue;
+        const container = elem.parentElement?.parentElement;
+        const ctx = container ? container.innerText.toLowerCase() : '';
+        // Only the matching element's text crosses back to Python
+        if (needles.some((t) => ctx.includes(t))) {
+            out.push(elem.innerText);
+        }
+    }
+    return out;
+}"""
+
 
 async def extract_carmignac_ytm(url: str, headless: bool = True) -> Dict:
     """
@@ -98,60 +129,6 @@ async def extract_carmignac_ytm(url: str, headless: bool = True) -> Dict:
     return result
 
 
-async def handle_modals(page) -> None:
-    """
-    Handle the 2-step modal process on Carmignac pages
-
-    Step 1: Accept data usage terms
-    Step 2: Confirm professional investor profile
-    """
-    try:
-        # Wait a bit for modals to appear
-        await asyncio.sleep(1)
-
-        # Common modal button selectors to try
-        modal_selectors = [
-            'button:has-text("Accept")',
-            'button:has-text("Accepter")',
-            'button:has-text("J\'accepte")',
-            'button:has-text("Continuer")',
-            'button:has-text("Continue")',
-            'button:has-text("Confirm")',
-            'button:has-text("Confirmer")',
-            '[data-testid*="accept"]',
-            '[class*="accept"]',
-            '[id*="accept"]',
-            '.modal button.primary',
-            '.cookie-consent button',
-        ]
-
-        # Try to click through up to 3 modal steps (accounting for cookie + 2-step process)
-        for step in range(3):
-            modal_clicked = False
-
-            for selector in modal_selectors:
-                try:
-                    button = page.locator(selector).first
-                    if await button.is_visible(timeout=2000):
-                        print(f"  → Modal step {step + 1}: Clicking '{selector}'")
-                        await button.click(timeout=5000)
-                        modal_clicked = True
-                        await asyncio.sleep(1)  # Wait for modal transition
-                        break
-                except:
-                    continue
-
-            if not modal_clicked:
-                # No more modals found
-                break
-
-        print("  ✓ Modal handling complete")
-
-    except Exception as e:
-        print(f"  ⚠️  Modal handling warning: {str(e)}")
-        # Continue anyway - page might not have modals
-
-
 async def extract_ytm_value(page) -> Optional[float]:
     """
     Extract Yield to Maturity value from page
@@ -167,24 +144,14 @@ async def extract_ytm_value(page) -> Optional[float]:
     ]
 
     try:
-        # Get page content
+        # Strategy 1: One regex pass over the HTML for any label followed by a percentage
+        # Pattern: "Label: X.XX%" or "Label X.XX%"; values in a separate
+        # element ("Label</span>X.XX%") are left to the DOM strategies below
         content = await page.content()
-
-        # Try to find YTM using various strategies
-
-        # Strategy 1: Look for text containing the label followed by percentage
-        for term in search_terms:
-            # Pattern: "Label: X.XX%" or "Label X.XX%" or "Label</span>X.XX%"
-            patterns = [
-                rf'{term}[:\s]*([0-9]+[.,][0-9]+)\s*%',
-                rf'{term}.*?([0-9]+[.,][0-9]+)\s*%',
-            ]
-
-            for pattern in patterns:
-                match = re.search(pattern, content, re.IGNORECASE | re.DOTALL)
-                if match:
-                    value_str = match.group(1).replace(',', '.')
-                    return float(value_str)
+        match = _YTM_HTML_RE.search(content)
+        if match:
+            value_str = match.group(1).replace(',', '.')
+            return float(value_str)
 
         # Strategy 2: Use Playwright locators to find elements
         for term in search_terms:
@@ -205,22 +172,13 @@ async def extract_ytm_value(page) -> Optional[float]:
                 continue
 
         # Strategy 3: Search all elements with percentage values near YTM-related text
-        percentage_elements = await page.locator('text=/%/').all()
-        for elem in percentage_elements:
-            try:
-                # Get surrounding context
-                text = await elem.inner_text()
-                parent = elem.locator('xpath=../..')
-                context_text = await parent.inner_text()
-
-                # Check if context mentions yield/maturity
-                if any(term.lower() in context_text.lower() for term in search_terms):
-                    match = re.search(r'([0-9]+[.,][0-9]+)\s*%', text)
-                    if match:
-                        value_str = match.group(1).replace(',', '.')
-                        return float(value_str)
-            except:
-                continue
+        # (collected in a single evaluate call instead of per-element round trips)
+        candidates = await page.evaluate(_PERCENT_CANDIDATES_JS, search_terms)
+        for candidate in candidates:
+            match = re.search(r'([0-9]+[.,][0-9]+)\s*%', candidate)
+            if match:
+                value_str = match.group(1).replace(',', '.')
+                return float(value_str)
 
         # Strategy 4: Take screenshot for debugging
         await page.screenshot(path=f'debug_screenshot_{datetime.now().strftime("%Y%m%d_%H%M%S")}.png')
@@ -0,0 +1,6 @@
+"""Entry point for ``python -m ytm_dashboard``"""
+
+from .main import main
+
+
+main()
@@ -3,6 +3,8 @@ Fund Configuration
 Defines all target-maturity funds to be tracked
 """
 
+from types import MappingProxyType
+
 FUND_CONFIG = {
     # Carmignac funds (web extraction)
     "carmignac_2027": {
@@ -66,3 +68,12 @@ FUND_CONFIG = {
         "source_type": "pdf"
     }
 }
+
+
+# FUND_CONFIG entries with their fund_id filled in, ready to pass to an
+# extractor. Built once here instead of copying each config per run;
+# read-only, since every extractor shares the same mappings.
+FUND_CONFIG_WITH_ID = MappingProxyType({
+    fund_id: MappingProxyType({**config, 'fund_id': fund_id})
+    for fund_id, config in FUND_CONFIG.items()
+})
@@ -8,13 +8,10 @@ import argparse
 import json
 import sys
 import os
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import List, Dict
 
-# Add current directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
-from database import DatabaseManager
+from .database import DatabaseManager
 
 # Provider color scheme - muted, sophisticated palette
 PROVIDER_COLORS = {
@@ -118,12 +115,46 @@ def get_all_report_dates() -> List[str]:
         return []
 
 
-def generate_all_dashboards(quiet: bool = False) -> bool:
+def get_last_updates() -> Dict[str, float]:
+    """Latest extraction time (Unix timestamp) of any record, per report date"""
+    try:
+        db_path = os.path.join(os.path.dirname(__file__), 'data', 'ytm_data.db')
+        db = DatabaseManager(db_path)
+
+        conn = db._get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT report_date, MAX(extraction_date)
+            FROM fund_ytm_data
+            GROUP BY report_date
+        """)
+        # CURRENT_TIMESTAMP is stored as UTC "YYYY-MM-DD HH:MM:SS"
+        updates = {
+            date: datetime.strptime(updated, '%Y-%m-%d %H:%M:%S')
+                          .replace(tzinfo=timezone.utc).timestamp()
+            for date, updated in cursor.fetchall()
+            if updated
+        }
+        conn.close()
+
+        return updates
+    except Exception as e:
+        print(f"❌ Error querying update times: {e}")
+        return {}
+
+
+def generate_all_dashboards(quiet: bool = False, force: bool = False) -> bool:
     """
     Generate dashboards for all months in database + latest index.html
 
+    Month pages are regenerated only when stale: missing, or older than the
+    latest extraction for that month. A month without a page adds a link to
+    every page's navigation, so it triggers a full regeneration. index.html
+    is always regenerated.
+
     Args:
         quiet: If True, suppress console output
+        force: If True, regenerate every month page
 
     Returns:
         True if successful, False if errors occurred
@@ -136,13 +167,29 @@ def generate_all_dashboards(quiet: bool = False) -> bool:
                 print("❌ No data in database")
             return False
 
+        base_dir = os.path.dirname(__file__)
+        output_paths = {
+            date: os.path.join(base_dir, get_output_filename(date)) for date in all_dates
+        }
+        if not all(os.path.exists(path) for path in output_paths.values()):
+            force = True
+
+        if force:
+            stale_dates = all_dates
+        else:
+            last_updates = get_last_updates()
+            stale_dates = [
+                date for date in all_dates
+                if os.path.getmtime(output_paths[date]) < last_updates.get(date, float('inf'))
+            ]
+
         if not quiet:
-            print(f"\n📊 Generating dashboards for {len(all_dates)} months...")
+            print(f"\n📊 Generating dashboards for {len(stale_dates)}/{len(all_dates)} months...")
 
         success_count = 0
 
-        # Generate dashboard for each historical month
-        for date in all_dates:
+        # Generate dashboard for each stale month
+        for date in stale_dates:
             try:
                 records = get_ytm_data(report_date=date)
                 if not records:
@@ -150,7 +197,7 @@ def generate_all_dashboards(quiet: bool = False) -> bool:
 
                 html_content = generate_dashboard_html(records, report_date=date)
                 filename = get_output_filename(date)
-                output_path = os.path.join(os.path.dirname(__file__), filename)
+                output_path = output_paths[date]
 
                 with open(output_path, 'w', encoding='utf-8') as f:
                     f.write(html_content)
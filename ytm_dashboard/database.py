@@ -1,9 +1,32 @@
 import sqlite3
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Set
 import os
 
 
+# Applied to every connection; none of these persist in the database file.
+# NORMAL is durable under WAL except across power loss, which a re-run covers.
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",  # 64 MiB
+)
+
+
+# Columns written by the insert methods, in VALUES order
+RECORD_COLUMNS = (
+    'fund_id', 'isin_code', 'fund_name', 'provider', 'fund_url',
+    'fund_maturity', 'yield_to_maturity', 'report_date',
+    'source_type', 'source_document'
+)
+
+
+def _record_values(record: Dict) -> tuple:
+    """Bind parameters for one record, in RECORD_COLUMNS order"""
+    return tuple(record.get(column) for column in RECORD_COLUMNS)
+
+
 class DatabaseManager:
     """Manages SQLite database operations for YTM data"""
 
@@ -15,23 +38,79 @@ class DatabaseManager:
             db_path: Path to SQLite database file
         """
         # Convert relative path to absolute path based on this file's location
-        if not os.path.isabs(db_path):
+        if db_path != ':memory:' and not os.path.isabs(db_path):
             base_dir = os.path.dirname(os.path.abspath(__file__))
             db_path = os.path.join(base_dir, db_path)
 
         self.db_path = db_path
         # Ensure directory exists
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        if db_path != ':memory:':
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+        # Connection of the open transaction() block, if any
+        self._tx_conn = None
 
     def _get_connection(self):
         """Get database connection"""
-        return sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path)
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group writes into a single transaction (one commit, one fsync)
+
+        Inside the block, insert_ytm_record() and insert_if_absent() reuse
+        the transaction's connection instead of committing on their own.
+        Commits on exit and rolls back if the block raises. Nested blocks
+        join the outer transaction.
+
+        Usage:
+            with db.transaction():
+                for record in records:
+                    db.insert_ytm_record(record)
+        """
+        if self._tx_conn is not None:
+            yield self
+            return
+
+        conn = self._get_connection()
+        conn.isolation_level = None  # BEGIN/COMMIT are issued explicitly
+        conn.execute("BEGIN IMMEDIATE")
+        self._tx_conn = conn
+        try:
+            yield self
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            self._tx_conn = None
+            conn.close()
+
+    def _finish_write(self, conn) -> None:
+        """Commit and close conn, unless it belongs to an open transaction()"""
+        if conn is not self._tx_conn:
+            conn.commit()
+            conn.close()
+
+    def _abort_write(self, conn) -> None:
+        """Close conn after a failed write, unless it belongs to a transaction()"""
+        if conn is not self._tx_conn:
+            conn.close()
 
     def init_db(self):
         """Create tables if they don't exist"""
         conn = self._get_connection()
         cursor = conn.cursor()
 
+        # WAL lets readers (view_database.py, dashboards) run during writes
+        # and commits cheaper; the mode is stored in the file, so set it once
+        if self.db_path != ':memory:':
+            cursor.execute("PRAGMA journal_mode=WAL")
+
         # Create main table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS fund_ytm_data (
@@ -76,7 +155,7 @@ class DatabaseManager:
         Returns:
             True if successful, False otherwise
         """
-        conn = self._get_connection()
+        conn = self._tx_conn or self._get_connection()
         cursor = conn.cursor()
 
         try:
@@ -86,26 +165,87 @@ class DatabaseManager:
                     fund_maturity, yield_to_maturity, report_date,
                     source_type, source_document
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                record.get('fund_id'),
-                record.get('isin_code'),
-                record.get('fund_name'),
-                record.get('provider'),
-                record.get('fund_url'),
-                record.get('fund_maturity'),
-                record.get('yield_to_maturity'),
-                record.get('report_date'),
-                record.get('source_type'),
-                record.get('source_document')
-            ))
+            """, _record_values(record))
 
-            conn.commit()
-            conn.close()
+            self._finish_write(conn)
             return True
 
         except Exception as e:
             print(f"❌ Database error: {e}")
-            conn.close()
+            self._abort_write(conn)
+            return False
+
+    def insert_ytm_records(self, records: List[Dict]) -> int:
+        """
+        Insert or update several YTM records with one prepared statement
+
+        Runs executemany() inside transaction(), so the batch is written
+        with a single commit and, unless it joined an outer transaction(),
+        rolled back as a whole on error.
+
+        Args:
+            records: Dictionaries containing fund data
+
+        Returns:
+            Number of rows written, 0 on error
+        """
+        if not records:
+            return 0
+
+        try:
+            with self.transaction():
+                cursor = self._tx_conn.executemany(f"""
+                    INSERT OR REPLACE INTO fund_ytm_data ({', '.join(RECORD_COLUMNS)})
+                    VALUES ({', '.join('?' * len(RECORD_COLUMNS))})
+                """, [_record_values(record) for record in records])
+                return cursor.rowcount
+
+        except Exception as e:
+            print(f"❌ Database error: {e}")
+            return 0
+
+    def insert_if_absent(self, record: Dict) -> bool:
+        """
+        Insert a YTM record unless one already exists for (fund_id, report_date)
+
+        Replaces the record_exists() + insert_ytm_record() pair with a single
+        round trip, relying on the UNIQUE(fund_id, report_date) constraint.
+        Only that conflict is skipped: other constraint violations (e.g. a
+        missing fund_url) raise sqlite3.IntegrityError.
+
+        Args:
+            record: Dictionary containing fund data
+
+        Returns:
+            True if the record was inserted, False if it already existed or on error
+
+        Raises:
+            sqlite3.IntegrityError: If the record violates a NOT NULL or CHECK constraint
+        """
+        conn = self._tx_conn or self._get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute("""
+                INSERT INTO fund_ytm_data (
+                    fund_id, isin_code, fund_name, provider, fund_url,
+                    fund_maturity, yield_to_maturity, report_date,
+                    source_type, source_document
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(fund_id, report_date) DO NOTHING
+            """, _record_values(record))
+
+            inserted = cursor.rowcount == 1
+            self._finish_write(conn)
+            return inserted
+
+        except sqlite3.IntegrityError:
+            self._abort_write(conn)
+            raise
+
+        except Exception as e:
+            print(f"❌ Database error: {e}")
+            self._abort_write(conn)
             return False
 
     def get_latest_records(self) -> List[Dict]:
@@ -187,6 +327,10 @@ class DatabaseManager:
         """
         Check if a record already exists
 
+        Prefer insert_if_absent() over calling this before insert_ytm_record():
+        it does the check and the insert in one query. To check many funds at
+        once, use existing_fund_ids().
+
         Args:
             fund_id: Unique fund identifier
             report_date: Date in YYYY-MM-01 format
@@ -206,6 +350,36 @@ class DatabaseManager:
         conn.close()
         return count > 0
 
+    def existing_fund_ids(self, fund_ids: List[str], report_date: str) -> Set[str]:
+        """
+        Find which of several funds already have a record for a month
+
+        One SELECT ... IN query in place of a record_exists() call per fund.
+
+        Args:
+            fund_ids: Fund identifiers to check
+            report_date: Date in YYYY-MM-01 format
+
+        Returns:
+            Subset of fund_ids with a record for report_date
+        """
+        fund_ids = list(fund_ids)
+        if not fund_ids:
+            return set()
+
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        placeholders = ', '.join('?' * len(fund_ids))
+        cursor.execute(f"""
+            SELECT fund_id FROM fund_ytm_data
+            WHERE report_date = ? AND fund_id IN ({placeholders})
+        """, (report_date, *fund_ids))
+
+        existing = {row[0] for row in cursor.fetchall()}
+        conn.close()
+        return existing
+
     def get_all_records(self) -> List[Dict]:
         """
         Get all records from the database
@@ -226,6 +400,32 @@ class DatabaseManager:
         conn.close()
         return results
 
+    def iter_all_records(self, batch_size: int = 256) -> Iterator[Dict]:
+        """
+        Stream all records, in get_all_records() order, without loading them all
+
+        Rows are fetched batch_size at a time, so the first rows are
+        available immediately and memory stays bounded on large histories.
+
+        Args:
+            batch_size: Rows per fetchmany() call
+
+        Yields:
+            Record dictionaries
+        """
+        conn = self._get_connection()
+        conn.row_factory = sqlite3.Row
+        try:
+            cursor = conn.execute("""
+                SELECT * FROM fund_ytm_data
+                ORDER BY report_date DESC, fund_maturity
+            """)
+            while batch := cursor.fetchmany(batch_size):
+                for row in batch:
+                    yield dict(row)
+        finally:
+            conn.close()
+
 
 if __name__ == "__main__":
     # Test the database
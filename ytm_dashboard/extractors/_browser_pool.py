@@ -0,0 +1,138 @@
+"""
+Shared Playwright browser for all extractors
+
+Chromium is launched once per run and handed out to every extractor.
+get_context() additionally caches one BrowserContext per site, so cookies,
+consent state and route handlers are set up once and later extractions only
+open (and close) their own pages. Given a user_data_dir, the context is a
+persistent one instead, keeping cookies and HTTP cache across runs. Call
+close_browser() once all extractions are done.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, FrozenSet, Hashable, Optional
+from playwright.async_api import async_playwright, Browser, BrowserContext, TimeoutError as PlaywrightTimeoutError
+
+
+_BROWSER_LOCK = asyncio.Lock()
+_PLAYWRIGHT = None
+_BROWSER: Optional[Browser] = None
+
+# Chromium flags shared by the pooled browser and persistent contexts
+LAUNCH_ARGS = ['--disable-blink-features=AutomationControlled']
+
+_CONTEXT_LOCK = asyncio.Lock()
+_CONTEXTS: Dict[Hashable, BrowserContext] = {}
+
+
+async def _start_playwright():
+    """Start Playwright on first use; call with _BROWSER_LOCK held"""
+    global _PLAYWRIGHT
+    if _PLAYWRIGHT is None:
+        _PLAYWRIGHT = await async_playwright().start()
+    return _PLAYWRIGHT
+
+
+async def get_browser() -> Browser:
+    """Return the shared Chromium instance, launching it on first use"""
+    global _BROWSER
+    async with _BROWSER_LOCK:
+        if _BROWSER is None or not _BROWSER.is_connected():
+            playwright = await _start_playwright()
+            _BROWSER = await playwright.chromium.launch(headless=True, args=LAUNCH_ARGS)
+        return _BROWSER
+
+
+async def get_context(key: Hashable,
+                      setup: Callable[[BrowserContext], Awaitable[None]] = None,
+                      user_data_dir: str = None,
+                      **context_options) -> BrowserContext:
+    """
+    Return the cached BrowserContext for key, creating it on first use
+
+    Callers must only open and close their own pages on the returned context,
+    never close the context itself.
+
+    Args:
+        key: Cache key, typically the provider name
+        setup: Optional coroutine run once on a new context (routes, cookies)
+        user_data_dir: Profile directory; if set, a persistent context is
+            launched there instead of a context on the shared browser
+        **context_options: Passed to new_context() / launch_persistent_context()
+
+    Returns:
+        Shared BrowserContext
+    """
+    async with _CONTEXT_LOCK:
+        context = _CONTEXTS.get(key)
+        if context is None:
+            if user_data_dir:
+                async with _BROWSER_LOCK:
+                    playwright = await _start_playwright()
+                context = await playwright.chromium.launch_persistent_context(
+                    user_data_dir, headless=True, args=LAUNCH_ARGS, **context_options
+                )
+            else:
+                browser = await get_browser()
+                context = await browser.new_context(**context_options)
+            # Drop the entry once the context (or its browser) goes away
+            context.on("close", lambda _, key=key: _CONTEXTS.pop(key, None))
+            if setup:
+                await setup(context)
+            _CONTEXTS[key] = context
+        return context
+
+
+async def close_browser() -> None:
+    """Close cached contexts and the shared Chromium instance, then stop Playwright"""
+    global _PLAYWRIGHT, _BROWSER
+    async with _CONTEXT_LOCK:
+        for context in list(_CONTEXTS.values()):
+            try:
+                await context.close()
+            except Exception:
+                pass
+        _CONTEXTS.clear()
+
+    async with _BROWSER_LOCK:
+        if _BROWSER is not None:
+            await _BROWSER.close()
+            _BROWSER = None
+        if _PLAYWRIGHT is not None:
+            await _PLAYWRIGHT.stop()
+            _PLAYWRIGHT = None
+
+
+async def wait_for_network_idle(page, timeout: int = 3000) -> None:
+    """Wait for the page to settle, giving up silently after timeout ms"""
+    try:
+        await page.wait_for_load_state('networkidle', timeout=timeout)
+    except PlaywrightTimeoutError:
+        pass
+
+
+# Resource types none of the extractors need to find and download a PDF
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet"})
+
+
+def resource_blocker(blocked_types: FrozenSet[str] = BLOCKED_RESOURCE_TYPES):
+    """
+    Build a context.route() handler aborting the given resource types
+
+    Args:
+        blocked_types: Playwright resource types to abort
+
+    Returns:
+        Async route handler; register with context.route("**/*", handler)
+    """
+    async def _block(route) -> None:
+        if route.request.resource_type in blocked_types:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    return _block
+
+
+# Default handler: abort images, media, fonts and stylesheets
+block_heavy_resources = resource_blocker()
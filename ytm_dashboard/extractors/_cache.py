@@ -0,0 +1,85 @@
+"""
+Small JSON-file caches kept next to the downloaded reports
+"""
+
+import os
+import json
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+
+REPORTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "reports")
+
+# Every JsonCache created, for flush_caches()
+_CACHES: List["JsonCache"] = []
+
+
+def not_past_month(key: str) -> bool:
+    """
+    Keep predicate for keys ending in ":YYYY-MM"
+
+    Entries for past months are never looked up again: reports are only
+    searched for the current month (or a backfilled one, fetched anew).
+    """
+    return key.rsplit(':', 1)[-1] >= datetime.now().strftime('%Y-%m')
+
+
+class JsonCache:
+    """String-keyed cache persisted as a single JSON object"""
+
+    def __init__(self, cache_path: str, keep: Callable[[str], bool] = None):
+        """
+        Args:
+            cache_path: JSON file holding {key: value}
+            keep: Optional predicate; keys it rejects are dropped when loading
+        """
+        self.cache_path = cache_path
+        self.keep = keep
+        self._entries: Optional[Dict[str, Any]] = None
+        self._dirty = False
+        _CACHES.append(self)
+
+    def _load(self) -> Dict[str, Any]:
+        if self._entries is None:
+            try:
+                with open(self.cache_path, 'r', encoding='utf-8') as f:
+                    entries = json.load(f)
+            except (OSError, ValueError):
+                entries = {}
+            if self.keep:
+                kept = {key: value for key, value in entries.items() if self.keep(key)}
+                # Rewrite the file on the next flush if anything was pruned
+                self._dirty = len(kept) != len(entries)
+                entries = kept
+            self._entries = entries
+        return self._entries
+
+    def get(self, key: str) -> Any:
+        """Return the cached value, or None on a miss"""
+        return self._load().get(key)
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a JSON-serialisable value; written to disk by flush()"""
+        self._load()[key] = value
+        self._dirty = True
+
+    def flush(self) -> None:
+        """Persist the cache file if it changed since it was loaded"""
+        if not self._dirty:
+            return
+        entries = self._entries
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = f"{self.cache_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.cache_path)
+            self._dirty = False
+        except OSError as e:
+            print(f"  ⚠️  Could not save {os.path.basename(self.cache_path)}: {e}")
+
+
+def flush_caches() -> None:
+    """Write every modified JsonCache to disk; call once all extractions are done"""
+    for cache in _CACHES:
+        cache.flush()
@@ -0,0 +1,138 @@
+"""
+Shared aiohttp session and streaming helpers for direct (browser-less) downloads
+"""
+
+import os
+import mmap
+from contextlib import contextmanager
+from typing import Dict, Optional
+import aiohttp
+
+
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+
+CHUNK_SIZE = 64 * 1024
+
+# Matches run_all()'s per-provider limit; idle connections are kept for reuse
+CONNECTIONS_PER_HOST = 2
+CONNECTION_LIMIT = 16
+KEEPALIVE_TIMEOUT = 60
+
+# Upper bound for one request including the body (aiohttp defaults to 5 min)
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=60)
+
+_SESSION: Optional[aiohttp.ClientSession] = None
+
+
+def get_session() -> aiohttp.ClientSession:
+    """
+    Return the shared HTTP session used for PDF downloads and page fetches
+
+    Every extractor in the process goes through this one session, so TLS
+    connections to a provider are reused across its funds.
+    """
+    global _SESSION
+    if _SESSION is None or _SESSION.closed:
+        _SESSION = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=CONNECTION_LIMIT,
+                limit_per_host=CONNECTIONS_PER_HOST,
+                keepalive_timeout=KEEPALIVE_TIMEOUT
+            ),
+            timeout=REQUEST_TIMEOUT
+        )
+    return _SESSION
+
+
+async def close_session() -> None:
+    """Close the shared HTTP session (call once all extractions are done)"""
+    global _SESSION
+    if _SESSION is not None:
+        await _SESSION.close()
+        _SESSION = None
+
+
+async def browser_headers(context, url: str) -> Dict[str, str]:
+    """
+    Headers carrying a browser context's cookies for url, so direct
+    downloads see the same session as the page (disclaimers, profiles)
+
+    Args:
+        context: Playwright BrowserContext
+        url: URL the request will be sent to
+
+    Returns:
+        Request headers
+    """
+    headers = {'User-Agent': USER_AGENT}
+    cookies = await context.cookies(url)
+    if cookies:
+        headers['Cookie'] = '; '.join(f"{c['name']}={c['value']}" for c in cookies)
+    return headers
+
+
+async def stream_to_file(url: str, dest_path: str, headers: Dict[str, str] = None) -> bool:
+    """
+    Download url to dest_path in chunks instead of buffering it in memory
+
+    Args:
+        url: Absolute URL
+        dest_path: File to write (overwritten)
+        headers: Optional request headers
+
+    Returns:
+        True on HTTP 200 with the body written, False on any other status
+    """
+    async with get_session().get(url, headers=headers) as response:
+        if response.status != 200:
+            return False
+        with open(dest_path, 'wb') as f:
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                f.write(chunk)
+    return True
+
+
+async def stream_pdf(url: str, pdf_path: str, headers: Dict[str, str] = None) -> bool:
+    """
+    Stream a PDF to disk
+
+    Writes to a temporary file that only replaces pdf_path once the
+    download completes and starts with the PDF magic bytes.
+
+    Returns:
+        True if pdf_path now holds the PDF, False otherwise
+    """
+    tmp_path = pdf_path + '.part'
+    try:
+        if not await stream_to_file(url, tmp_path, headers):
+            return False
+
+        with open(tmp_path, 'rb') as f:
+            if f.read(4) != b'%PDF':
+                return False
+
+        os.replace(tmp_path, pdf_path)
+        return True
+
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+@contextmanager
+def mapped_file(path: str):
+    """
+    Memory-map a file read-only; yields b'' for empty files, which mmap rejects
+
+    Slicing, hashing and bytes.find-style lookups work on the map without
+    copying the whole file into Python memory.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield mm
+        finally:
+            mm.close()
@@ -0,0 +1,84 @@
+"""
+Carmignac cookie and investor-profile modals
+
+Kept apart from the PDF extractor so the standalone web-page YTM extractor
+can click through the modals without importing the PDF stack.
+"""
+
+from ._browser_pool import wait_for_network_idle
+
+
+# Modal buttons, in the order they are tried: button labels first, then CSS hooks
+MODAL_BUTTON_TEXTS = [
+    "Accept",
+    "Accepter",
+    "J'accepte",
+    "Continuer",
+    "Continue",
+    "Confirm",
+    "Confirmer",
+]
+
+MODAL_CSS_SELECTORS = [
+    '[data-testid*="accept"]',
+    '[class*="accept"]',
+    '[id*="accept"]',
+    '.modal button.primary',
+    '.cookie-consent button',
+]
+
+# Clicks through up to maxSteps modal steps inside the page and returns the
+# number of buttons clicked. Label matching mirrors Playwright's
+# case-insensitive :has-text().
+_CLICK_MODAL_BUTTONS_JS = """async ([texts, selectors, maxSteps]) => {
+    const visible = (el) => el.offsetParent !== null;
+    const findButton = () => {
+        const buttons = Array.from(document.querySelectorAll('button')).filter(visible);
+        for (const text of texts) {
+            const needle = text.toLowerCase();
+            const button = buttons.find((b) => b.textContent.toLowerCase().includes(needle));
+            if (button) return button;
+        }
+        for (const selector of selectors) {
+            const el = document.querySelector(selector);
+            if (el && visible(el)) return el;
+        }
+        return null;
+    };
+
+    let clicked = 0;
+    for (let step = 0; step < maxSteps; step++) {
+        const button = findButton();
+        if (!button) break;
+        button.click();
+        clicked++;
+        // Give the next modal step time to render
+        await new Promise((resolve) => setTimeout(resolve, 300));
+    }
+    return clicked;
+}"""
+
+
+async def handle_modals(page) -> None:
+    """
+    Handle the 2-step modal process on Carmignac pages
+
+    Step 1: Accept data usage terms
+    Step 2: Confirm professional investor profile
+    """
+    try:
+        await wait_for_network_idle(page)
+
+        # Click through up to 3 modal steps in a single round trip
+        clicked = await page.evaluate(
+            _CLICK_MODAL_BUTTONS_JS,
+            [MODAL_BUTTON_TEXTS, MODAL_CSS_SELECTORS, 3]
+        )
+        if clicked:
+            print(f"  → Clicked {clicked} modal button(s)")
+            await wait_for_network_idle(page)
+
+        print("  ✓ Modals handled")
+
+    except Exception as e:
+        print(f"  ⚠️  Modal warning: {str(e)}")
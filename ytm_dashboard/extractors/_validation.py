@@ -0,0 +1,149 @@
+"""
+Shared lookups for validating downloaded monthly report PDFs
+"""
+
+import re
+import os
+import hashlib
+from functools import lru_cache
+from typing import Optional, Set, Tuple
+import fitz
+
+# Optional: PDFium's text extractor is faster still on page-0 text and is
+# Apache/BSD licensed; PyMuPDF is used when it isn't installed
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+from ._cache import JsonCache, REPORTS_DIR, not_past_month
+
+
+# ISIN as printed on report first pages, e.g. "ISIN: FR0011234567"
+ISIN_RE = re.compile(r'ISIN[:\s]+([A-Z]{2}[A-Z0-9]{10})')
+
+# Month names in French and English, indexed by month number (1-12).
+# The first entry of each tuple is used in error messages.
+MONTH_NAMES = (
+    None,
+    ('janvier', 'january'),
+    ('février', 'february', 'fevrier'),
+    ('mars', 'march'),
+    ('avril', 'april'),
+    ('mai', 'may'),
+    ('juin', 'june'),
+    ('juillet', 'july'),
+    ('août', 'august', 'aout'),
+    ('septembre', 'september'),
+    ('octobre', 'october'),
+    ('novembre', 'november'),
+    ('décembre', 'december', 'decembre'),
+)
+
+# One compiled alternation per month, so the month check is a single search
+# of the page rather than a substring scan per name
+MONTH_RES = (None,) + tuple(
+    re.compile('|'.join(map(re.escape, names)), re.IGNORECASE)
+    for names in MONTH_NAMES[1:]
+)
+
+# Markers of KIID/DIC documents, which must never be taken for monthly reports
+KIID_KEYWORDS = ("Document d'informations clés", "KIID", "Document d'information clé")
+
+
+@lru_cache(maxsize=None)
+def _keyword_pattern(fund_names: Tuple[str, ...]) -> re.Pattern:
+    """
+    Build one alternation tagging every validation keyword with a named group
+
+    Groups: 'kiid' and 'fund', both case-sensitive like the substring checks
+    they replace. The expected month is checked separately with MONTH_RES.
+    """
+    return re.compile(
+        '(?P<kiid>' + '|'.join(map(re.escape, KIID_KEYWORDS)) + ')'
+        '|(?P<fund>' + '|'.join(map(re.escape, fund_names)) + ')'
+    )
+
+
+def scan_keywords(text: str, fund_names: Tuple[str, ...]) -> Set[str]:
+    """
+    Scan text once and return the tags of every keyword category found
+
+    Args:
+        text: First-page text of the PDF
+        fund_names: Strings any of which identifies the expected fund
+
+    Returns:
+        Set of group names, e.g. {'fund'}
+    """
+    return {m.lastgroup for m in _keyword_pattern(fund_names).finditer(text)}
+
+
+def first_page_text(source) -> str:
+    """
+    Extract the text of page 0 with pypdfium2, or PyMuPDF if unavailable
+
+    Validation only needs raw first-page text, so a C-backed parser is used
+    here; pdfplumber stays on the layout-sensitive YTM extraction path.
+
+    Args:
+        source: PDF file bytes, or the path of a PDF on disk
+
+    Returns:
+        Text of the first page
+    """
+    if pdfium is not None:
+        pdf = pdfium.PdfDocument(source)
+        try:
+            page = pdf[0]
+            textpage = page.get_textpage()
+            text = textpage.get_text_range()
+            textpage.close()
+            page.close()
+            return text
+        finally:
+            pdf.close()
+
+    doc = fitz.open(source) if isinstance(source, str) else fitz.open(stream=source, filetype="pdf")
+    with doc:
+        return doc.load_page(0).get_text("text")
+
+
+# Smallest plausible monthly report; anything below is an error page or stub
+MIN_PDF_SIZE = 16 * 1024
+
+
+def pdf_shape_error(content) -> Optional[str]:
+    """
+    Cheap structural checks run before any PDF parser is opened
+
+    Only slices the content, so it works on bytes and memory maps alike.
+
+    Args:
+        content: PDF file bytes (or a memory map of them)
+
+    Returns:
+        Rejection reason, or None if the content looks like a complete PDF
+    """
+    if content[:5] != b'%PDF-':
+        return "Not a PDF"
+    if len(content) < MIN_PDF_SIZE:
+        return f"PDF too small ({len(content):,} bytes)"
+    if b'%%EOF' not in content[-1024:]:
+        return "Truncated PDF (no %%EOF trailer)"
+    return None
+
+
+def validation_cache_key(content: bytes, fund_id: str, expected_report_month: str = None) -> str:
+    """
+    Build the VALIDATION_CACHE key for a PDF validated against a fund and month
+
+    The same document can be valid for one fund/month and not another, so
+    both are part of the key alongside the SHA-256 of the bytes.
+    """
+    digest = hashlib.sha256(content).hexdigest()
+    return f"{digest}:{fund_id}:{expected_report_month or ''}"
+
+
+# validate_pdf_content() results as [is_valid, reason]
+VALIDATION_CACHE = JsonCache(os.path.join(REPORTS_DIR, ".validation_cache.json"), keep=not_past_month)
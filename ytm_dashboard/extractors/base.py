@@ -1,12 +1,30 @@
+import asyncio
+import os
 from abc import ABC, abstractmethod
-from typing import Dict
+from typing import Dict, List, Mapping, Optional, Tuple
 from datetime import datetime
+from urllib.parse import urljoin
+
+from ._cache import JsonCache, REPORTS_DIR, not_past_month
+from ._http import USER_AGENT, mapped_file, stream_to_file
+from ._validation import (
+    ISIN_RE, MONTH_NAMES, MONTH_RES, VALIDATION_CACHE,
+    first_page_text, pdf_shape_error, scan_keywords, validation_cache_key
+)
+from ..pdf_utils.ytm_extractor import extract_ytm_from_pdf
+
+
+# Last report URL that validated, per "fund_name:YYYY-MM"
+URL_CACHE = JsonCache(os.path.join(REPORTS_DIR, ".url_cache.json"), keep=not_past_month)
 
 
 class BaseExtractor(ABC):
     """Base class for all fund data extractors"""
 
-    def __init__(self, config: dict):
+    # Strings accepted in place of the exact fund name when validating a PDF
+    FUND_NAME_ALIASES: Tuple[str, ...] = ()
+
+    def __init__(self, config: Mapping):
         """
         Initialize the extractor with fund configuration
 
@@ -25,12 +43,18 @@ class BaseExtractor(ABC):
         self.source_type = config.get('source_type')
 
     @abstractmethod
-    async def extract(self, report_date: str = None) -> Dict:
+    async def extract(self, report_date: str = None, force: bool = False) -> Dict:
         """
         Extract YTM data for the fund
 
+        Implementations must be safe to run concurrently with other
+        extractors: they share the browser and per-site contexts from
+        _browser_pool and must only close the pages they opened.
+
         Args:
             report_date: Target month (YYYY-MM-01), defaults to current month
+            force: Ignore PDFs kept on disk from a previous run and download
+                again (only extractors that keep one, e.g. Carmignac)
 
         Returns:
             {
@@ -50,6 +74,158 @@ class BaseExtractor(ABC):
         """
         pass
 
+    def validate_pdf_content(self, content: bytes, expected_report_month: str = None) -> Tuple[bool, str]:
+        """
+        Validate that downloaded PDF is the correct monthly report
+
+        Args:
+            content: PDF file bytes
+            expected_report_month: Expected month in format "YYYY-MM" (e.g., "2025-11")
+
+        Returns:
+            (is_valid, reason)
+        """
+        # Reject error pages and truncated downloads before parsing anything
+        shape_error = pdf_shape_error(content)
+        if shape_error:
+            return False, shape_error
+        return self._validate_cached(content, content, expected_report_month)
+
+    def validate_pdf_file(self, pdf_path: str, expected_report_month: str = None) -> Tuple[bool, str]:
+        """
+        Validate a PDF on disk without reading it into memory
+
+        The file is memory-mapped for the structural checks and content hash,
+        and the text parser reads page 0 straight from the path.
+
+        Args:
+            pdf_path: Path to the PDF file
+            expected_report_month: Expected month in format "YYYY-MM" (e.g., "2025-11")
+
+        Returns:
+            (is_valid, reason)
+        """
+        try:
+            with mapped_file(pdf_path) as content:
+                shape_error = pdf_shape_error(content)
+                if shape_error:
+                    return False, shape_error
+                return self._validate_cached(content, pdf_path, expected_report_month)
+        except OSError as e:
+            return False, f"Validation error: {str(e)}"
+
+    def _validate_cached(self, content, source, expected_report_month: str = None) -> Tuple[bool, str]:
+        """
+        Validate through VALIDATION_CACHE
+
+        Args:
+            content: PDF bytes (or a memory map of them), used for the cache key
+            source: What to parse on a cache miss: the bytes or the file path
+            expected_report_month: Expected month in format "YYYY-MM" (e.g., "2025-11")
+
+        Returns:
+            (is_valid, reason)
+        """
+        # Reruns and retries see the same bytes; skip re-parsing them
+        cache_key = validation_cache_key(content, self.fund_id, expected_report_month)
+        cached = VALIDATION_CACHE.get(cache_key)
+        if cached is not None:
+            return tuple(cached)
+
+        try:
+            result = self._check_pdf_content(source, expected_report_month)
+        except Exception as e:
+            return False, f"Validation error: {str(e)}"
+
+        VALIDATION_CACHE.put(cache_key, list(result))
+        return result
+
+    def _check_pdf_content(self, source, expected_report_month: str = None) -> Tuple[bool, str]:
+        """
+        Run the validation checks on a PDF (raises on unreadable PDFs)
+
+        Args:
+            source: PDF file bytes, or the path of a PDF on disk
+            expected_report_month: Expected month in format "YYYY-MM" (e.g., "2025-11")
+
+        Returns:
+            (is_valid, reason)
+        """
+        return self._check_first_page(first_page_text(source), expected_report_month)
+
+    def _check_first_page(self, first_page: str, expected_report_month: str = None) -> Tuple[bool, str]:
+        """
+        Run the validation checks on already-extracted first-page text
+
+        Args:
+            first_page: Text of the PDF's first page
+            expected_report_month: Expected month in format "YYYY-MM" (e.g., "2025-11")
+
+        Returns:
+            (is_valid, reason)
+        """
+        # Tag KIID markers and fund names in a single pass
+        hits = scan_keywords(first_page, (self.fund_name,) + self.FUND_NAME_ALIASES)
+
+        # Checks 1-2: Reject KIID/DIC documents and other funds' reports
+        reason = self._wrong_document_reason(first_page, hits)
+        if reason:
+            return False, reason
+
+        # Check 3: Validate fund name
+        if 'fund' not in hits:
+            return False, f"Fund name '{self.fund_name}' not found in PDF"
+
+        # Check 4: Validate report month if specified
+        if expected_report_month:
+            year, month = expected_report_month.split('-')
+            month_num = int(month)
+
+            expected_month_names = MONTH_NAMES[month_num]
+
+            # The month is almost always in the title band ("Reporting Novembre
+            # 2025"), so try plain substring finds there before scanning the page
+            header = first_page[:1024].lower()
+            month_found = (any(name in header for name in expected_month_names)
+                           or MONTH_RES[month_num].search(first_page) is not None)
+            if not month_found:
+                return False, f"PDF doesn't contain expected month ({expected_month_names[0]} {year})"
+
+        return True, "PDF validated successfully"
+
+    def _wrong_document_reason(self, first_page: str, hits=None) -> Optional[str]:
+        """
+        Look for positive evidence that the PDF is not this fund's report
+
+        Unlike the fund name and month checks, these hold on partial text
+        (e.g. a page read from the head of a truncated PDF).
+
+        Args:
+            first_page: Text of the PDF's first page (possibly partial)
+            hits: Result of scan_keywords on first_page, if already computed
+
+        Returns:
+            Rejection reason, or None if nothing proves it is the wrong document
+        """
+        if hits is None:
+            hits = scan_keywords(first_page, (self.fund_name,) + self.FUND_NAME_ALIASES)
+
+        # Check 1: Reject KIID/DIC documents
+        if 'kiid' in hits:
+            return "PDF is a KIID/DIC, not a monthly report"
+
+        # Check 2: Extract and validate ISIN if configured
+        isin_match = ISIN_RE.search(first_page)
+
+        if self.isin_code:
+            if isin_match:
+                found_isin = isin_match.group(1)
+                if found_isin != self.isin_code:
+                    return f"ISIN mismatch: expected {self.isin_code}, found {found_isin}"
+            # If ISIN is configured but not found in PDF, that's okay (some monthly reports don't have ISIN)
+
+        return None
+
     def _get_report_date(self, report_date: str = None) -> str:
         """
         Get report date in YYYY-MM-01 format
@@ -101,3 +277,185 @@ class BaseExtractor(ABC):
             'success': success,
             'error': error
         }
+
+
+class PdfReportExtractor(BaseExtractor):
+    """Base class for extractors that download a monthly report PDF and parse it"""
+
+    async def extract(self, report_date: str = None, force: bool = False) -> Dict:
+        """
+        Download the monthly report PDF with download_report() and parse it
+        with extract_ytm_from_pdf()
+
+        Args:
+            report_date: Target month (YYYY-MM-01), defaults to current month
+            force: Unused, reports are not kept on disk between runs
+
+        Returns:
+            Standardized result dictionary (see BaseExtractor.extract)
+        """
+        report_date = self._get_report_date(report_date)
+        expected_month = self._expected_report_month(report_date)
+
+        try:
+            print(f"\n{'='*50}")
+            print(f"Extracting: {self.fund_name}")
+            print(f"{'='*50}")
+
+            # Step 1: Download PDF
+            print("📥 Downloading PDF report...")
+            pdf_path = await self.download_report(expected_month)
+
+            if not pdf_path:
+                return self._build_result(
+                    report_date=report_date,
+                    error="Failed to download PDF report"
+                )
+
+            # Step 2: Extract YTM from PDF. Parsing is CPU-bound, so run it
+            # off the event loop to let other extractions keep making progress
+            print("📊 Extracting YTM from PDF...")
+            pdf_result = await asyncio.to_thread(extract_ytm_from_pdf, pdf_path, self.provider)
+
+            if pdf_result['success']:
+                ytm = pdf_result['yield_to_maturity']
+                # Use PDF-extracted date if available, otherwise use report_date
+                extracted_date = pdf_result.get('report_date') or report_date
+
+                print(f"✅ Extracted: {ytm}%")
+                return self._build_result(
+                    yield_to_maturity=ytm,
+                    report_date=extracted_date,
+                    source_document=pdf_path,
+                    success=True
+                )
+            else:
+                print(f"❌ Failed to extract YTM: {pdf_result['error']}")
+                return self._build_result(
+                    report_date=report_date,
+                    source_document=pdf_path,
+                    error=f"PDF extraction failed: {pdf_result['error']}"
+                )
+
+        except Exception as e:
+            error = f"Unexpected error: {str(e)}"
+            print(f"❌ {error}")
+            return self._build_result(report_date=report_date, error=error)
+
+    @abstractmethod
+    async def download_report(self, expected_month: str = None) -> str:
+        """
+        Download the monthly report PDF
+
+        Args:
+            expected_month: Expected month in YYYY-MM format for validation
+
+        Returns:
+            Path to downloaded PDF, or None if failed
+        """
+        pass
+
+    async def _download_from_url_cache(self, expected_month: str, report_path: str) -> str:
+        """
+        Re-fetch the report from the URL that validated on a previous run
+
+        Skips the browser entirely; any failure (missing entry, HTTP error,
+        non-PDF or invalid content) returns None so the caller falls back to
+        the full browser flow.
+
+        Args:
+            expected_month: Expected month in YYYY-MM format
+            report_path: Where to save the PDF
+
+        Returns:
+            report_path on success, None otherwise
+        """
+        report_url = URL_CACHE.get(f"{self.fund_name}:{expected_month}")
+        if not report_url:
+            return None
+
+        print("⚡ Trying last known report URL...")
+        tmp_path = report_path + '.part'
+        try:
+            try:
+                downloaded = await stream_to_file(report_url, tmp_path, {'User-Agent': USER_AGENT})
+            except Exception as e:
+                print(f"  ⚠️  Cached URL failed: {e}")
+                return None
+
+            if not downloaded:
+                print("  ⚠️  Cached URL no longer serves the report")
+                return None
+
+            is_valid, reason = await asyncio.to_thread(self.validate_pdf_file, tmp_path, expected_month)
+            if not is_valid:
+                print(f"  ❌ PDF invalid: {reason}")
+                return None
+
+            os.replace(tmp_path, report_path)
+
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        file_size = os.path.getsize(report_path)
+        print(f"✅ PDF downloaded from cached URL ({file_size:,} bytes)")
+        return report_path
+
+    def _remember_report_url(self, expected_month: str, report_url: str) -> None:
+        """Record the URL of a validated report for _download_from_url_cache()"""
+        URL_CACHE.put(f"{self.fund_name}:{expected_month}", urljoin(self.url, report_url))
+
+    def _expected_report_month(self, report_date: str) -> str:
+        """
+        Month (YYYY-MM) the downloaded report must cover for report_date
+
+        Args:
+            report_date: Report date in YYYY-MM-01 format
+
+        Returns:
+            Expected month in YYYY-MM format
+        """
+        return report_date[:7]  # "2025-12-01" -> "2025-12"
+
+
+async def run_all(extractors: List[BaseExtractor], report_date: str = None,
+                  max_concurrency: int = 4, max_per_provider: int = 2,
+                  force: bool = False) -> List[Dict]:
+    """
+    Run several extractors concurrently, at most max_concurrency at a time
+
+    Extractions for the same provider hit the same site, so they are further
+    limited to max_per_provider at a time; different providers run freely.
+
+    All extractors share a single Chromium instance and per-site contexts,
+    so each extra slot only costs a page rather than a new browser process.
+    An extractor that raises gets a failed result instead of aborting the
+    other extractions.
+
+    Args:
+        extractors: Extractor instances to run
+        report_date: Target month (YYYY-MM-01) passed to every extract() call
+        max_concurrency: Maximum number of extractions in flight
+        max_per_provider: Maximum number of extractions in flight per provider
+        force: Passed to every extract() call to bypass downloaded PDFs
+
+    Returns:
+        Result dictionaries, in the same order as extractors
+    """
+    sem = asyncio.Semaphore(max_concurrency)
+    provider_sems = {
+        provider: asyncio.Semaphore(max_per_provider)
+        for provider in {e.provider for e in extractors}
+    }
+
+    async def _run(extractor: BaseExtractor) -> Dict:
+        # Provider slot first, so a waiting fund doesn't hold a global slot
+        async with provider_sems[extractor.provider], sem:
+            try:
+                return await extractor.extract(report_date, force=force)
+            except Exception as e:
+                print(f"❌ Error ({extractor.fund_id}): {e}")
+                return extractor._build_result(report_date=report_date, error=str(e))
+
+    return await asyncio.gather(*(_run(e) for e in extractors))
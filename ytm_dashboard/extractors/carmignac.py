@@ -1,29 +1,124 @@
 import asyncio
-from playwright.async_api import async_playwright
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from datetime import datetime, timedelta
 from pathlib import Path
 import os
-import sys
 import re
 import io
-from typing import Dict, Tuple
+import json
+from typing import Dict, Optional, Tuple
+import fitz
 import pdfplumber
 
-# Import parent directory for pdf_utils
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from .base import BaseExtractor
+from ._modals import handle_modals
+from ._browser_pool import get_context, block_heavy_resources
+from ._http import USER_AGENT, browser_headers, stream_pdf
+
+# Factsheet date header and KEY FIGURES line, matched in a single scan
+# Date (English): "Monthly Factsheet - DD/MM/YYYY"
+# Date (French): "Reporting mensuel - DD/MM/YYYY"
+# YTM: "Yield to Maturity (EUR) (1)   4.6%"
+_COMBINED_RE = re.compile(
+    r'(?P<date>(?:Monthly Factsheet|Reporting mensuel)\s*-\s*(?P<day>\d{2})/(?P<month>\d{2})/(?P<year>\d{4}))'
+    r'|(?P<ytm>Yield to Maturity[^\n]*?\(EUR\)[^\n]*?(?P<ytm_value>\d+\.?\d*)%)',
+    re.IGNORECASE
+)
+
+_DATE_NOT_FOUND = "Could not find date pattern in PDF (tried both English and French formats)"
+
+# Header date and KEY FIGURES sit in the top part of page 0
+HEADER_CLIP_RATIO = 0.6
+
+def _first_page_text(pdf_path: str, clip_ratio: float = None) -> str:
+    """
+    Extract the text of the first page of a PDF
+
+    Uses PyMuPDF, which is much faster than pdfplumber for plain text.
+    Falls back to pdfplumber if PyMuPDF returns no text.
+
+    Args:
+        pdf_path: Path to the PDF file
+        clip_ratio: Only read the top fraction of the page (e.g. 0.6), or None for the full page
+
+    Returns:
+        First page text (may be empty)
+    """
+    doc = fitz.open(pdf_path)
+    try:
+        page = doc.load_page(0)
+        if clip_ratio:
+            rect = page.rect
+            clip = fitz.Rect(0, 0, rect.width, rect.height * clip_ratio)
+            text = page.get_text("text", clip=clip)
+        else:
+            text = page.get_text("text")
+    finally:
+        doc.close()
+
+    if not text.strip():
+        with pdfplumber.open(pdf_path) as pdf:
+            page = pdf.pages[0]
+            if clip_ratio:
+                page = page.crop((0, 0, page.width, page.height * clip_ratio))
+            text = page.extract_text() or ""
+
+    return text
+
+
+# Any link that may lead to the factsheet; its presence means the page has rendered
+FACTSHEET_LINK_SELECTOR = (
+    'a[href*="factsheet"], a[href*="reporting"], a[href$=".pdf"], '
+    'a:has-text("Factsheet"), a:has-text("mensuel")'
+)
+
+
+async def _setup_context(context) -> None:
+    """One-time setup of the cached Carmignac context"""
+    # Only HTML and scripts are needed to find the factsheet link
+    await context.route("**/*", block_heavy_resources)
+
+
+async def _save_storage_state(context, state_path: str) -> None:
+    """
+    Persist the context's cookies and localStorage for the next run
+
+    Written to a temporary file first so that a concurrent extraction never
+    reads a half-written state file.
+    """
+    try:
+        state = await context.storage_state()
+        tmp_path = f"{state_path}.{os.getpid()}.{id(context)}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, state_path)
+    except Exception as e:
+        print(f"  ⚠️  Could not save browser state: {e}")
+
+
+def _is_cached_pdf(pdf_path: str) -> bool:
+    """Check that a previously downloaded file exists and looks like a complete PDF"""
+    if not os.path.exists(pdf_path) or os.path.getsize(pdf_path) <= 1024:
+        return False
+    with open(pdf_path, 'rb') as f:
+        return f.read(4) == b'%PDF'
 
 
 class CarmignacExtractor(BaseExtractor):
     """Extractor for Carmignac fund YTM data (PDF download + extraction)"""
 
-    async def extract(self, report_date: str = None) -> Dict:
+    def __init__(self, config: dict):
+        super().__init__(config)
+        # First page text per PDF path, shared by date and YTM extraction
+        self._first_page_cache = {}
+
+    async def extract(self, report_date: str = None, force: bool = False) -> Dict:
         """
         Extract YTM data from Carmignac fund by downloading and parsing PDF
 
         Args:
             report_date: Target month (YYYY-MM-01), defaults to current month
+            force: Re-download the factsheet even if it is already on disk
 
         Returns:
             Standardized result dictionary
@@ -37,7 +132,7 @@ class CarmignacExtractor(BaseExtractor):
 
             # Step 1: Download PDF
             print("📥 Downloading Monthly Factsheet PDF...")
-            pdf_path = await self.download_factsheet()
+            pdf_path = await self.download_factsheet(report_date, force=force)
 
             if not pdf_path:
                 return self._build_result(
@@ -45,15 +140,27 @@ class CarmignacExtractor(BaseExtractor):
                     error="Failed to download Monthly Factsheet PDF"
                 )
 
+            # Parse page 0 once and share it between date and YTM extraction.
+            # Parsing is CPU-bound, so run it off the event loop to let other
+            # extractions keep making progress.
+            try:
+                fields = await asyncio.to_thread(self._read_first_page_fields, pdf_path)
+            except Exception as e:
+                return self._build_result(
+                    report_date=report_date,
+                    source_document=pdf_path,
+                    error=f"Could not extract factsheet date: Error reading PDF: {str(e)}"
+                )
+
             # Step 2: Extract and validate factsheet date
             print("🗓️  Validating factsheet date...")
-            factsheet_date, date_error = self.extract_factsheet_date(pdf_path)
+            factsheet_date = fields['factsheet_date']
 
             if not factsheet_date:
                 return self._build_result(
                     report_date=report_date,
                     source_document=pdf_path,
-                    error=f"Could not extract factsheet date: {date_error}"
+                    error=f"Could not extract factsheet date: {_DATE_NOT_FOUND}"
                 )
 
             # Validate factsheet date matches expected month
@@ -64,6 +171,16 @@ class CarmignacExtractor(BaseExtractor):
 
             if not is_valid:
                 print(f"  ⚠️  {validation_msg}")
+                # A factsheet older than the month it was cached for was
+                # downloaded before the new one came out: drop it so the next
+                # run fetches it again. A newer one (backfilling a past month)
+                # is the right file for its name and is kept.
+                if factsheet_date < datetime.strptime(report_date, '%Y-%m-%d'):
+                    try:
+                        os.remove(pdf_path)
+                        self._first_page_cache.clear()
+                    except OSError:
+                        pass
                 return self._build_result(
                     report_date=report_date,
                     source_document=pdf_path,
@@ -74,7 +191,7 @@ class CarmignacExtractor(BaseExtractor):
 
             # Step 3: Extract YTM from PDF
             print("📊 Extracting YTM from PDF...")
-            ytm = self.extract_ytm_from_pdf(pdf_path)
+            ytm = fields['yield_to_maturity']
 
             if ytm is None:
                 return self._build_result(
@@ -96,10 +213,14 @@ class CarmignacExtractor(BaseExtractor):
             print(f"❌ {error}")
             return self._build_result(report_date=report_date, error=error)
 
-    async def download_factsheet(self) -> str:
+    async def download_factsheet(self, report_date: str, force: bool = False) -> str:
         """
         Download the Monthly Factsheet PDF from Carmignac fund page
 
+        Args:
+            report_date: Target month (YYYY-MM-01), used to name the cached file
+            force: Re-download even if the PDF for this month is already on disk
+
         Returns:
             Path to downloaded PDF, or None if failed
         """
@@ -108,93 +229,51 @@ class CarmignacExtractor(BaseExtractor):
         output_dir = os.path.join(base_dir, "reports")
         Path(output_dir).mkdir(parents=True, exist_ok=True)
 
-        try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(
-                    headless=True,
-                    args=['--disable-blink-features=AutomationControlled']
-                )
+        timestamp = report_date[:7].replace('-', '')  # "2025-11-01" -> "202511"
+        safe_fund_name = self.fund_name.lower().replace(' ', '_')
+        pdf_filename = f"{safe_fund_name}_factsheet_{timestamp}.pdf"
+        pdf_path = os.path.join(output_dir, pdf_filename)
 
-                context = await browser.new_context(
-                    viewport={'width': 1920, 'height': 1080},
-                    locale='en-US',
-                    user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
-                    accept_downloads=True
-                )
+        # Reuse the factsheet for this month if already downloaded
+        if not force and _is_cached_pdf(pdf_path):
+            print(f"✅ Using cached PDF ({os.path.getsize(pdf_path):,} bytes)")
+            return pdf_path
 
-                page = await context.new_page()
+        try:
+            # Cookies saved after a previous run let the site skip its modals
+            state_path = os.path.join(output_dir, 'carmignac_state.json')
+
+            context = await get_context(
+                'carmignac',
+                _setup_context,
+                viewport={'width': 1920, 'height': 1080},
+                locale='en-US',
+                user_agent=USER_AGENT,
+                accept_downloads=True,
+                storage_state=state_path if os.path.exists(state_path) else None
+            )
 
+            page = await context.new_page()
+            download_page = None
+            try:
                 # Navigate to fund page
                 print(f"📄 Loading page: {self.url}")
-                await page.goto(self.url, wait_until='domcontentloaded', timeout=30000)
-                await asyncio.sleep(3)
+                # Return as soon as the response lands; the selector wait below
+                # is what actually tells us the links are in the DOM
+                await page.goto(self.url, wait_until='commit', timeout=30000)
+                try:
+                    await page.wait_for_selector(FACTSHEET_LINK_SELECTOR, timeout=15000)
+                except PlaywrightTimeoutError:
+                    pass
 
                 # Handle modals (reuse existing modal handling code)
-                await self.handle_modals(page)
+                await handle_modals(page)
+                await _save_storage_state(context, state_path)
 
                 # Find "Monthly Factsheet" or "Reporting mensuel" download link
-                factsheet_url = None
-
-                # Strategy 1: Look for text links (English and French)
-                text_patterns = [
-                    "Monthly Factsheet",
-                    "monthly factsheet",
-                    "Reporting mensuel",
-                    "reporting mensuel"
-                ]
-
-                for text in text_patterns:
-                    if factsheet_url:
-                        break
-                    try:
-                        factsheet_link = page.locator(f'a:has-text("{text}")').first
-                        if await factsheet_link.is_visible(timeout=2000):
-                            href = await factsheet_link.get_attribute('href')
-                            if href:
-                                factsheet_url = href
-                                print(f"  ✓ Found factsheet link: '{text}'")
-                                break
-                    except:
-                        pass
+                factsheet_url = await self.find_factsheet_url(page)
 
-                # Strategy 2: Look for href patterns containing factsheet/reporting
                 if not factsheet_url:
-                    href_patterns = ['factsheet', 'reporting', 'mensuel']
-                    for pattern in href_patterns:
-                        try:
-                            links = await page.locator(f'a[href*="{pattern}"]').all()
-                            for link in links:
-                                href = await link.get_attribute('href')
-                                if href and href.endswith('.pdf'):
-                                    factsheet_url = href
-                                    print(f"  ✓ Found PDF via href pattern: '{pattern}'")
-                                    break
-                            if factsheet_url:
-                                break
-                        except:
-                            pass
-
-                # Strategy 3: Look for any PDF link in Key documents section
-                if not factsheet_url:
-                    try:
-                        # Find PDF links
-                        pdf_links = await page.locator('a[href$=".pdf"]').all()
-                        for link in pdf_links:
-                            href = await link.get_attribute('href')
-                            # Get link text or parent text for context
-                            try:
-                                link_text = await link.inner_text()
-                                if any(keyword in link_text.lower() for keyword in ['factsheet', 'reporting', 'mensuel', 'monthly']):
-                                    factsheet_url = href
-                                    print(f"  ✓ Found PDF via link text")
-                                    break
-                            except:
-                                pass
-                    except:
-                        pass
-
-                if not factsheet_url:
-                    await browser.close()
                     print("❌ Could not find Monthly Factsheet download link")
                     return None
 
@@ -205,28 +284,17 @@ class CarmignacExtractor(BaseExtractor):
 
                 # Download the PDF
                 print(f"⬇️  Downloading PDF...")
-                timestamp = datetime.now().strftime('%Y%m')
-                safe_fund_name = self.fund_name.lower().replace(' ', '_')
-                pdf_filename = f"{safe_fund_name}_factsheet_{timestamp}.pdf"
-                pdf_path = os.path.join(output_dir, pdf_filename)
 
-                # Try API download
+                # Try direct download, streamed to disk with the page's cookies
                 try:
-                    response = await page.request.get(factsheet_url)
+                    headers = await browser_headers(context, factsheet_url)
 
-                    if response.ok:
-                        content = await response.body()
-
-                        if content.startswith(b'%PDF'):
-                            with open(pdf_path, 'wb') as f:
-                                f.write(content)
-
-                            file_size = os.path.getsize(pdf_path)
-                            print(f"✅ PDF downloaded ({file_size:,} bytes)")
-                            await browser.close()
-                            return pdf_path
-                        else:
-                            raise Exception("Not a PDF")
+                    if await stream_pdf(factsheet_url, pdf_path, headers):
+                        file_size = os.path.getsize(pdf_path)
+                        print(f"✅ PDF downloaded ({file_size:,} bytes)")
+                        return pdf_path
+                    else:
+                        raise Exception("Not a PDF")
                 except:
                     # Try navigation download
                     download_page = await context.new_page()
@@ -240,15 +308,17 @@ class CarmignacExtractor(BaseExtractor):
 
                         file_size = os.path.getsize(pdf_path)
                         print(f"✅ PDF downloaded ({file_size:,} bytes)")
-                        await browser.close()
                         return pdf_path
 
                     except Exception as e:
                         print(f"❌ Download failed: {e}")
-                        await browser.close()
                         return None
 
-                await browser.close()
+            finally:
+                # Only the pages are ours; the cached context stays up
+                await page.close()
+                if download_page:
+                    await download_page.close()
 
         except Exception as e:
             print(f"❌ Error downloading factsheet: {str(e)}")
@@ -256,86 +326,174 @@ class CarmignacExtractor(BaseExtractor):
 
         return None
 
-    async def handle_modals(self, page) -> None:
+    async def find_factsheet_url(self, page) -> Optional[str]:
         """
-        Handle the 2-step modal process on Carmignac pages
+        Find the Monthly Factsheet link, running all search strategies concurrently
+
+        The strategies run at the same time, but their results are taken in
+        priority order: a looser strategy's link is only used once every
+        stricter one has come back empty, whichever finishes first.
 
-        Step 1: Accept data usage terms
-        Step 2: Confirm professional investor profile
+        Returns:
+            Factsheet href, or None if no strategy found it
         """
+        tasks = [
+            asyncio.create_task(self._strategy_text(page)),
+            asyncio.create_task(self._strategy_href(page)),
+            asyncio.create_task(self._strategy_pdf_text(page)),
+        ]
+        labels = ["by text", "via href pattern", "via link text"]
+
         try:
-            await asyncio.sleep(1)
-
-            modal_selectors = [
-                'button:has-text("Accept")',
-                'button:has-text("Accepter")',
-                'button:has-text("J\'accepte")',
-                'button:has-text("Continuer")',
-                'button:has-text("Continue")',
-                'button:has-text("Confirm")',
-                'button:has-text("Confirmer")',
-                '[data-testid*="accept"]',
-                '[class*="accept"]',
-                '[id*="accept"]',
-                '.modal button.primary',
-                '.cookie-consent button',
-            ]
-
-            # Try to click through up to 3 modal steps
-            for step in range(3):
-                modal_clicked = False
-
-                for selector in modal_selectors:
-                    try:
-                        button = page.locator(selector).first
-                        if await button.is_visible(timeout=2000):
-                            print(f"  → Clicking modal button")
-                            await button.click(timeout=5000)
-                            modal_clicked = True
-                            await asyncio.sleep(1)
-                            break
-                    except:
-                        continue
+            for task, label in zip(tasks, labels):
+                try:
+                    href = await task
+                except Exception:
+                    continue
+                if href:
+                    print(f"  ✓ Found factsheet link {label}")
+                    return href
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        return None
+
+    async def _strategy_text(self, page) -> Optional[str]:
+        """Strategy 1: Look for text links (English and French)"""
+        try:
+            # has-text is case-insensitive, so one selector covers all spellings,
+            # and :is() lets the browser match both labels in a single query
+            factsheet_link = page.locator('a:is(:has-text("Monthly Factsheet"), :has-text("Reporting mensuel"))').first
+            href = await factsheet_link.get_attribute('href', timeout=2000)
+            if href:
+                return href
+        except:
+            pass
+        return None
 
-                if not modal_clicked:
-                    break
+    async def _strategy_href(self, page) -> Optional[str]:
+        """Strategy 2: Look for href patterns containing factsheet/reporting"""
+        href_patterns = ['factsheet', 'reporting', 'mensuel']
+        for pattern in href_patterns:
+            try:
+                links = await page.locator(f'a[href*="{pattern}"]').all()
+                for link in links:
+                    href = await link.get_attribute('href')
+                    if href and href.endswith('.pdf'):
+                        return href
+            except:
+                pass
+        return None
 
-            print("  ✓ Modals handled")
+    async def _strategy_pdf_text(self, page) -> Optional[str]:
+        """Strategy 3: Look for any PDF link in Key documents section"""
+        try:
+            # Find PDF links
+            pdf_links = await page.locator('a[href$=".pdf"]').all()
+            for link in pdf_links:
+                href = await link.get_attribute('href')
+                # Get link text or parent text for context
+                try:
+                    link_text = await link.inner_text()
+                    if any(keyword in link_text.lower() for keyword in ['factsheet', 'reporting', 'mensuel', 'monthly']):
+                        return href
+                except:
+                    pass
+        except:
+            pass
+        return None
 
-        except Exception as e:
-            print(f"  ⚠️  Modal warning: {str(e)}")
+    def _load_first_page_text(self, pdf_path: str, clipped: bool = False) -> str:
+        """
+        Get first page text, parsing each PDF at most once per extractor
 
-    def extract_factsheet_date(self, pdf_path: str) -> Tuple[datetime, str]:
+        Args:
+            pdf_path: Path to downloaded PDF
+            clipped: Only read the header area (top HEADER_CLIP_RATIO of the page)
+
+        Returns:
+            First page text
+        """
+        key = (pdf_path, clipped)
+        if key not in self._first_page_cache:
+            clip_ratio = HEADER_CLIP_RATIO if clipped else None
+            self._first_page_cache[key] = _first_page_text(pdf_path, clip_ratio)
+        return self._first_page_cache[key]
+
+    def _read_first_page_fields(self, pdf_path: str) -> Dict:
+        """
+        Parse the factsheet header area, falling back to the full first page
+
+        Args:
+            pdf_path: Path to downloaded PDF
+
+        Returns:
+            Fields dictionary as returned by _parse_first_page
+        """
+        fields = self._parse_first_page(self._load_first_page_text(pdf_path, clipped=True))
+        if not fields['factsheet_date'] or fields['yield_to_maturity'] is None:
+            # Layout differs from usual: fall back to the full page
+            fields = self._parse_first_page(self._load_first_page_text(pdf_path))
+        return fields
+
+    def _parse_first_page(self, text: str) -> Dict:
+        """
+        Find the factsheet date and YTM in a single pass over page 0
+
+        Args:
+            text: First page text
+
+        Returns:
+            {
+                'factsheet_date': datetime or None,
+                'factsheet_date_str': str or None,  # DD/MM/YYYY as printed
+                'yield_to_maturity': float or None
+            }
+        """
+        fields = {
+            'factsheet_date': None,
+            'factsheet_date_str': None,
+            'yield_to_maturity': None
+        }
+
+        for match in _COMBINED_RE.finditer(text):
+            if match.group('date') and fields['factsheet_date'] is None:
+                day, month, year = match.group('day', 'month', 'year')
+                try:
+                    fields['factsheet_date'] = datetime.strptime(f"{year}-{month}-{day}", '%Y-%m-%d')
+                    fields['factsheet_date_str'] = f"{day}/{month}/{year}"
+                except ValueError:
+                    continue
+            elif match.group('ytm') and fields['yield_to_maturity'] is None:
+                fields['yield_to_maturity'] = float(match.group('ytm_value'))
+
+            if fields['factsheet_date'] and fields['yield_to_maturity'] is not None:
+                break
+
+        return fields
+
+    def extract_factsheet_date(self, pdf_path: str, text: str = None) -> Tuple[datetime, str]:
         """
         Extract factsheet date from PDF header
 
         Args:
             pdf_path: Path to downloaded PDF
+            text: First page text, if already extracted
 
         Returns:
             (datetime object, error message) or (None, error)
         """
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                first_page = pdf.pages[0].extract_text()
-
-                # Patterns: Support both English and French versions
-                # English: "Monthly Factsheet - DD/MM/YYYY"
-                # French: "Reporting mensuel - DD/MM/YYYY"
-                patterns = [
-                    r'Monthly Factsheet\s*-\s*(\d{2})/(\d{2})/(\d{4})',
-                    r'Reporting mensuel\s*-\s*(\d{2})/(\d{2})/(\d{4})',
-                ]
-
-                for pattern in patterns:
-                    match = re.search(pattern, first_page, re.IGNORECASE)
-                    if match:
-                        day, month, year = match.groups()
-                        date_str = f"{year}-{month}-{day}"
-                        factsheet_date = datetime.strptime(date_str, '%Y-%m-%d')
-                        return factsheet_date, f"{day}/{month}/{year}"
-
-                return None, "Could not find date pattern in PDF (tried both English and French formats)"
+            first_page = text if text is not None else self._load_first_page_text(pdf_path)
+
+            fields = self._parse_first_page(first_page)
+
+            if fields['factsheet_date']:
+                return fields['factsheet_date'], fields['factsheet_date_str']
+
+            return None, _DATE_NOT_FOUND
 
         except Exception as e:
             return None, f"Error reading PDF: {str(e)}"
@@ -379,35 +537,21 @@ class CarmignacExtractor(BaseExtractor):
         expected_month_name = expected_dt.strftime('%B %Y')
         return False, f"Factsheet date ({factsheet_month_name}) doesn't match expected month ({expected_month_name})"
 
-    def extract_ytm_from_pdf(self, pdf_path: str) -> float:
+    def extract_ytm_from_pdf(self, pdf_path: str, text: str = None) -> float:
         """
         Extract Yield to Maturity (EUR) from PDF KEY FIGURES section
 
         Args:
             pdf_path: Path to downloaded PDF
+            text: First page text, if already extracted
 
         Returns:
             YTM value as float, or None if not found
         """
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                first_page = pdf.pages[0].extract_text()
-
-                # Pattern: "Yield to Maturity (EUR) (1)   4.6%"
-                # Look for the line and extract percentage
-                patterns = [
-                    r'Yield to Maturity \(EUR\)[^\n]*?(\d+\.?\d*)%',  # "Yield to Maturity (EUR) (1)   4.6%"
-                    r'Yield to Maturity[^\n]*?\(EUR\)[^\n]*?(\d+\.?\d*)%',  # Alternative format
-                ]
-
-                for pattern in patterns:
-                    match = re.search(pattern, first_page, re.IGNORECASE)
-                    if match:
-                        ytm_str = match.group(1)
-                        ytm = float(ytm_str)
-                        return ytm
-
-                return None
+            first_page = text if text is not None else self._load_first_page_text(pdf_path)
+
+            return self._parse_first_page(first_page)['yield_to_maturity']
 
         except Exception as e:
             print(f"  ❌ Error extracting YTM: {str(e)}")
@@ -1,143 +1,61 @@
 import asyncio
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from datetime import datetime, timedelta
 from pathlib import Path
 import os
-import sys
-import re
-import io
-from typing import Dict, Tuple
-import pdfplumber
+import tempfile
 
-# Import parent directory for pdf_utils
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from .base import PdfReportExtractor
+from ._browser_pool import get_context, resource_blocker, wait_for_network_idle
+from ._cache import REPORTS_DIR
+from ._http import browser_headers, stream_to_file
+from ._validation import first_page_text
 
-from .base import BaseExtractor
-from pdf_utils.ytm_extractor import extract_ytm_from_pdf
 
+# Bytes requested up front when probing candidate PDFs; usually covers page 0
+RANGE_PROBE_BYTES = 64 * 1024
 
-class RothschildExtractor(BaseExtractor):
-    """Extractor for Rothschild fund YTM data (PDF download + extraction)"""
+# Playwright profile kept next to the reports between runs
+PROFILE_DIR = os.path.join(os.path.dirname(REPORTS_DIR), ".pw-profile-rothschild")
 
-    async def extract(self, report_date: str = None) -> Dict:
-        """
-        Extract YTM data from Rothschild fund by downloading and parsing PDF
+_BLOCK_MEDIA = resource_blocker(frozenset({"image", "media", "font"}))
 
-        Args:
-            report_date: Target month (YYYY-MM-01), defaults to current month
 
-        Returns:
-            Standardized result dictionary
-        """
-        report_date = self._get_report_date(report_date)
+def _absolute_url(href: str) -> str:
+    """Resolve a site-relative link against the Rothschild AM domain"""
+    if href.startswith('/'):
+        return f"https://am.eu.rothschildandco.com{href}"
+    return href
 
-        try:
-            print(f"\n{'='*50}")
-            print(f"Extracting: {self.fund_name}")
-            print(f"{'='*50}")
-
-            # Step 1: Download PDF
-            print("📥 Downloading PDF report...")
-            pdf_path = await self.download_report()
-
-            if not pdf_path:
-                return self._build_result(
-                    report_date=report_date,
-                    error="Failed to download PDF report"
-                )
-
-            # Step 2: Extract YTM from PDF
-            print("📊 Extracting YTM from PDF...")
-            pdf_result = extract_ytm_from_pdf(pdf_path, self.provider)
-
-            if pdf_result['success']:
-                ytm = pdf_result['yield_to_maturity']
-                extracted_date = pdf_result.get('report_date') or report_date
-
-                print(f"✅ Extracted: {ytm}%")
-                return self._build_result(
-                    yield_to_maturity=ytm,
-                    report_date=extracted_date,
-                    source_document=pdf_path,
-                    success=True
-                )
-            else:
-                print(f"❌ Failed to extract YTM: {pdf_result['error']}")
-                return self._build_result(
-                    report_date=report_date,
-                    source_document=pdf_path,
-                    error=f"PDF extraction failed: {pdf_result['error']}"
-                )
 
-        except Exception as e:
-            error = f"Unexpected error: {str(e)}"
-            print(f"❌ {error}")
-            return self._build_result(report_date=report_date, error=error)
+async def _setup_context(context) -> None:
+    """One-time setup of the cached Rothschild context"""
+    # Stylesheets stay on: the modal and cookie checks rely on CSS visibility
+    await context.route("**/*", _BLOCK_MEDIA)
 
-    def validate_pdf_content(self, content: bytes, expected_report_month: str = None) -> Tuple[bool, str]:
-        """
-        Validate that downloaded PDF is the correct monthly report
 
-        Args:
-            content: PDF file bytes
-            expected_report_month: Expected month in format "YYYY-MM" (e.g., "2025-11")
+# Text and href of every PDF link, fetched in one round trip
+_PDF_LINKS_JS = """() => Array.from(document.querySelectorAll('a[href$=".pdf"]'))
+    .map((a) => ({text: a.innerText || '', href: a.getAttribute('href') || ''}))"""
 
-        Returns:
-            (is_valid, reason)
-        """
-        try:
-            with pdfplumber.open(io.BytesIO(content)) as pdf:
-                first_page = pdf.pages[0].extract_text()
-
-                # Check 1: Reject KIID/DIC documents
-                if any(kw in first_page for kw in ["Document d'informations clés", "KIID", "Document d'information clé"]):
-                    return False, "PDF is a KIID/DIC, not a monthly report"
-
-                # Check 2: Extract and validate ISIN if configured
-                isin_match = re.search(r'ISIN[:\s]+([A-Z]{2}[A-Z0-9]{10})', first_page)
-
-                if self.isin_code:
-                    if isin_match:
-                        found_isin = isin_match.group(1)
-                        if found_isin != self.isin_code:
-                            return False, f"ISIN mismatch: expected {self.isin_code}, found {found_isin}"
-                    # If ISIN is configured but not found in PDF, that's okay (some monthly reports don't have ISIN)
-
-                # Check 3: Validate fund name
-                if self.fund_name not in first_page and "Target 202" not in first_page:
-                    return False, f"Fund name '{self.fund_name}' not found in PDF"
-
-                # Check 4: Validate report month if specified
-                if expected_report_month:
-                    year, month = expected_report_month.split('-')
-                    month_num = int(month)
-
-                    # Month names in French and English
-                    month_names = {
-                        1: ['janvier', 'january'], 2: ['février', 'february', 'fevrier'],
-                        3: ['mars', 'march'], 4: ['avril', 'april'],
-                        5: ['mai', 'may'], 6: ['juin', 'june'],
-                        7: ['juillet', 'july'], 8: ['août', 'august', 'aout'],
-                        9: ['septembre', 'september'], 10: ['octobre', 'october'],
-                        11: ['novembre', 'november'], 12: ['décembre', 'december', 'decembre']
-                    }
-
-                    expected_month_names = month_names.get(month_num, [])
-                    first_page_lower = first_page.lower()
-
-                    # Check if any expected month name is in the PDF
-                    if not any(name in first_page_lower for name in expected_month_names):
-                        return False, f"PDF doesn't contain expected month ({expected_month_names[0]} {year})"
-
-                return True, "PDF validated successfully"
 
-        except Exception as e:
-            return False, f"Validation error: {str(e)}"
+class RothschildExtractor(PdfReportExtractor):
+    """Extractor for Rothschild fund YTM data (PDF download + extraction)"""
+
+    FUND_NAME_ALIASES = ("Target 202",)
+
+    def _expected_report_month(self, report_date: str) -> str:
+        """Rothschild publishes last month's report, whatever report_date is"""
+        current_date = datetime.now()
+        return (current_date.replace(day=1) - timedelta(days=1)).strftime('%Y-%m')
 
-    async def download_report(self) -> str:
+    async def download_report(self, expected_month: str = None) -> str:
         """
         Download the latest monthly report PDF
 
+        Args:
+            expected_month: Expected month in YYYY-MM format, defaults to previous month
+
         Returns:
             Path to downloaded PDF, or None if failed
         """
@@ -146,29 +64,36 @@ class RothschildExtractor(BaseExtractor):
         output_dir = os.path.join(base_dir, "reports")
         Path(output_dir).mkdir(parents=True, exist_ok=True)
 
-        # Calculate expected report month (previous month)
-        current_date = datetime.now()
-        expected_month = (current_date.replace(day=1) - timedelta(days=1)).strftime('%Y-%m')
-
-        try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(
-                    headless=True,
-                    args=['--disable-blink-features=AutomationControlled']
-                )
+        if not expected_month:
+            expected_month = self._expected_report_month(None)
 
-                context = await browser.new_context(
-                    viewport={'width': 1920, 'height': 1080},
-                    user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
-                    accept_downloads=True
-                )
+        timestamp = expected_month.replace('-', '')  # Use expected_month (e.g., "2025-11" → "202511")
+        safe_fund_name = self.fund_name.lower().replace(' ', '_').replace('-', '_')
+        report_filename = f"{safe_fund_name}_report_{timestamp}.pdf"
+        report_path = os.path.join(output_dir, report_filename)
 
-                page = await context.new_page()
+        # Fast path: reuse the URL that validated earlier this month
+        if await self._download_from_url_cache(expected_month, report_path):
+            return report_path
 
+        try:
+            # Persistent profile: the OneTrust consent cookie and HTTP cache
+            # survive between runs, so warm starts skip the consent banner
+            context = await get_context(
+                'rothschild',
+                _setup_context,
+                user_data_dir=PROFILE_DIR,
+                viewport={'width': 1920, 'height': 1080},
+                user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
+                accept_downloads=True
+            )
+
+            page = await context.new_page()
+            try:
                 # Navigate to page
                 print("📄 Loading page...")
                 await page.goto(self.url, wait_until='domcontentloaded', timeout=30000)
-                await asyncio.sleep(2)
+                await wait_for_network_idle(page, timeout=15000)
 
                 # Handle cookie consent
                 print("🍪 Handling cookie consent...")
@@ -184,27 +109,24 @@ class RothschildExtractor(BaseExtractor):
 
                 # Find and download report
                 print("⬇️  Finding report download link...")
-                report_url, content = await self.find_report(page)
+                report_url, tmp_path = await self.find_report(page, expected_month)
 
-                if not content:
-                    await browser.close()
+                if not tmp_path:
                     return None
 
-                # Save PDF
-                timestamp = expected_month.replace('-', '')  # Use expected_month (e.g., "2025-11" → "202511")
-                safe_fund_name = self.fund_name.lower().replace(' ', '_').replace('-', '_')
-                report_filename = f"{safe_fund_name}_report_{timestamp}.pdf"
-                report_path = os.path.join(output_dir, report_filename)
-
-                with open(report_path, 'wb') as f:
-                    f.write(content)
+                # Move the validated download into place
+                os.replace(tmp_path, report_path)
 
                 file_size = os.path.getsize(report_path)
                 print(f"✅ PDF downloaded ({file_size:,} bytes)")
+                self._remember_report_url(expected_month, report_url)
 
-                await browser.close()
                 return report_path
 
+            finally:
+                # Only the page is ours; the cached context stays up
+                await page.close()
+
         except Exception as e:
             print(f"❌ Error downloading report: {str(e)}")
             return None
@@ -212,6 +134,12 @@ class RothschildExtractor(BaseExtractor):
     async def handle_cookie_consent(self, page):
         """Handle OneTrust GDPR cookie consent banner"""
         try:
+            # Consent given on a previous run is kept in the persistent profile
+            cookies = await page.context.cookies(page.url)
+            if any(c['name'] == 'OptanonAlertBoxClosed' for c in cookies):
+                print("  ✓ Cookie consent already stored")
+                return
+
             cookie_selectors = [
                 '#onetrust-accept-btn-handler',
                 'button:has-text("ACCEPT ALL COOKIES")',
@@ -223,7 +151,10 @@ class RothschildExtractor(BaseExtractor):
                     elem = page.locator(selector).first
                     if await elem.is_visible(timeout=3000):
                         await elem.click()
-                        await asyncio.sleep(1)
+                        try:
+                            await elem.wait_for(state='hidden', timeout=3000)
+                        except PlaywrightTimeoutError:
+                            pass
                         print("  ✓ Cookie consent handled")
                         return
                 except:
@@ -244,20 +175,17 @@ class RothschildExtractor(BaseExtractor):
 
             print("  → Selecting country...")
             await page.click('#styled_filter_country_language')
-            await asyncio.sleep(0.5)
+            await page.wait_for_selector('ul.select-options li[rel="fr-fr"]', state='visible', timeout=5000)
             await page.click('ul.select-options li[rel="fr-fr"]')
-            await asyncio.sleep(0.5)
 
             print("  → Selecting profile...")
             await page.click('#styled_filter_user_type')
-            await asyncio.sleep(0.5)
+            await page.wait_for_selector('ul.select-options li[rel="professional"]', state='visible', timeout=5000)
             await page.click('ul.select-options li[rel="professional"]')
-            await asyncio.sleep(0.5)
 
             print("  → Checking acknowledgment...")
             await page.wait_for_selector('#i_agree:not([disabled])', timeout=5000)
             await page.check('#i_agree')
-            await asyncio.sleep(0.5)
 
             print("  → Submitting...")
             await page.wait_for_selector('button.btnSubmit:not([disabled])', timeout=5000)
@@ -265,7 +193,7 @@ class RothschildExtractor(BaseExtractor):
 
             await page.wait_for_selector('section.modal#modal_disclaimer', state='hidden', timeout=10000)
             print("  ✓ Modal handled")
-            await asyncio.sleep(2)
+            await wait_for_network_idle(page)
 
         except Exception as e:
             print(f"  ⚠️  Modal error: {e}")
@@ -284,7 +212,7 @@ class RothschildExtractor(BaseExtractor):
                     elem = page.locator(selector).first
                     if await elem.is_visible(timeout=2000):
                         await elem.click()
-                        await asyncio.sleep(1)
+                        await self._wait_for_pdf_links(page)
                         print(f"  ✓ Clicked Reporting tab")
                         return
                 except:
@@ -292,7 +220,7 @@ class RothschildExtractor(BaseExtractor):
 
             # Scroll and try again
             await page.evaluate("window.scrollTo(0, document.body.scrollHeight / 2)")
-            await asyncio.sleep(1)
+            await wait_for_network_idle(page, timeout=2000)
 
             for selector in reporting_selectors:
                 try:
@@ -300,7 +228,7 @@ class RothschildExtractor(BaseExtractor):
                     if await elem.is_visible(timeout=2000):
                         await elem.scroll_into_view_if_needed()
                         await elem.click()
-                        await asyncio.sleep(1)
+                        await self._wait_for_pdf_links(page)
                         print(f"  ✓ Found Reporting section")
                         return
                 except:
@@ -311,12 +239,16 @@ class RothschildExtractor(BaseExtractor):
         except Exception as e:
             print(f"  ⚠️  Navigation error: {e}")
 
-    async def find_report(self, page):
+    async def _wait_for_pdf_links(self, page):
+        """Wait until the Reporting tab has rendered its PDF links"""
+        try:
+            await page.wait_for_selector('a[href$=".pdf"]', state='attached', timeout=5000)
+        except PlaywrightTimeoutError:
+            pass
+
+    async def find_report(self, page, expected_month: str):
         """Find and download the monthly report PDF with validation"""
         try:
-            # Calculate expected report month (previous month)
-            current_date = datetime.now()
-            expected_month = (current_date.replace(day=1) - timedelta(days=1)).strftime('%Y-%m')
 
             # Strategy 1: Try specific monthly report selectors
             pdf_selectors = [
@@ -326,76 +258,159 @@ class RothschildExtractor(BaseExtractor):
                 'a[href$=".pdf"]:has-text("Monthly")',
             ]
 
+            # The selectors overlap ("Rapport mensuel" also matches "Mensuel"),
+            # so keep each URL once to avoid downloading the same PDF twice
+            candidates = []
+            tested = set()
             for selector in pdf_selectors:
                 try:
                     elem = page.locator(selector).first
                     if await elem.is_visible(timeout=2000):
-                        report_url = await elem.get_attribute('href')
+                        report_url = _absolute_url(await elem.get_attribute('href'))
+                        if report_url in tested:
+                            continue
                         text = await elem.inner_text()
-
-                        # Make URL absolute
-                        if report_url.startswith('/'):
-                            report_url = f"https://am.eu.rothschildandco.com{report_url}"
-
-                        # Download and validate
-                        print(f"  → Testing PDF: {text[:50]}")
-                        response = await page.request.get(report_url)
-
-                        if response.ok:
-                            content = await response.body()
-
-                            if content.startswith(b'%PDF'):
-                                # Validate content
-                                is_valid, reason = self.validate_pdf_content(content, expected_month)
-
-                                if is_valid:
-                                    print(f"  ✅ Found and validated: {text[:50]}")
-                                    return report_url, content
-                                else:
-                                    print(f"  ❌ PDF invalid: {reason}")
-                                    continue  # Try next PDF
+                        tested.add(report_url)
+                        candidates.append((report_url, text))
                 except:
                     continue
 
+            found = await self._first_valid(page, candidates, expected_month)
+            if found:
+                return found
+
             # Strategy 2: Iterate through all PDFs and filter
             print("  → Searching all PDF links...")
-            pdf_links = await page.query_selector_all('a[href$=".pdf"]')
+            pdf_links = await page.evaluate(_PDF_LINKS_JS)
 
+            candidates = []
             for link in pdf_links:
-                try:
-                    text = await link.inner_text()
-                    href = await link.get_attribute('href')
-
-                    # Filter for monthly reports, exclude KIID/DIC
-                    if any(kw in text.lower() for kw in ['mensuel', 'monthly report', 'rapport mensuel']):
-                        if not any(exclude in text.lower() for exclude in ['dic', 'kiid', 'document d\'information']):
-
-                            # Make URL absolute
-                            if href.startswith('/'):
-                                href = f"https://am.eu.rothschildandco.com{href}"
-
-                            # Download and validate
-                            print(f"  → Testing PDF: {text[:50]}")
-                            response = await page.request.get(href)
-
-                            if response.ok:
-                                content = await response.body()
-
-                                if content.startswith(b'%PDF'):
-                                    # Validate content
-                                    is_valid, reason = self.validate_pdf_content(content, expected_month)
-
-                                    if is_valid:
-                                        print(f"  ✅ Found and validated: {text[:50]}")
-                                        return href, content
-                                    else:
-                                        print(f"  ❌ PDF invalid: {reason}")
-                                        continue
-                except:
-                    continue
+                text = link['text']
+                href = _absolute_url(link['href'])
+
+                # Filter for monthly reports, exclude KIID/DIC
+                if any(kw in text.lower() for kw in ['mensuel', 'monthly report', 'rapport mensuel']):
+                    if not any(exclude in text.lower() for exclude in ['dic', 'kiid', 'document d\'information']):
+                        if href not in tested:
+                            tested.add(href)
+                            candidates.append((href, text))
+
+            found = await self._first_valid(page, candidates, expected_month)
+            if found:
+                return found
 
             raise Exception("Could not find valid monthly report PDF")
 
         except Exception as e:
             print(f"  ❌ Download error: {e}")
             return None, None
+
+    async def _first_valid(self, page, candidates, expected_month: str):
+        """
+        Download and validate candidate PDFs concurrently
+
+        Args:
+            page: Playwright page whose request context carries the site cookies
+            candidates: List of (absolute_url, link_text)
+            expected_month: Expected month in YYYY-MM format
+
+        Returns:
+            (url, temp_path) of the first candidate to validate, or None
+        """
+        async def fetch_and_validate(url, text):
+            print(f"  → Testing PDF: {text[:50]}")
+            try:
+                tmp_path = await self.fetch_candidate(page, url, expected_month)
+            except Exception:
+                return None
+            return (url, text, tmp_path) if tmp_path else None
+
+        tasks = [asyncio.create_task(fetch_and_validate(url, text)) for url, text in candidates]
+        tmp_path = None
+        try:
+            for fut in asyncio.as_completed(tasks):
+                found = await fut
+                if found:
+                    url, text, tmp_path = found
+                    print(f"  ✅ Found and validated: {text[:50]}")
+                    return url, tmp_path
+        finally:
+            # Stop the slower downloads once one candidate has won; cancelled
+            # ones clean up after themselves, finished runners-up are dropped here
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for task in tasks:
+                if task.done() and not task.cancelled() and task.result():
+                    loser_path = task.result()[2]
+                    if loser_path != tmp_path and os.path.exists(loser_path):
+                        os.remove(loser_path)
+
+        return None
+
+    async def fetch_candidate(self, page, url: str, expected_month: str):
+        """
+        Download a candidate PDF, rejecting wrong documents from their first bytes
+
+        A ranged request fetches the head of the file first; if page 0 can be
+        read from it and shows a KIID marker or another fund's ISIN, the full
+        download is skipped. Anything else, including a head that cannot be
+        parsed (e.g. xref at the tail), falls through to the full download.
+
+        Args:
+            page: Playwright page whose request context carries the site cookies
+            url: Absolute PDF URL
+            expected_month: Expected month in YYYY-MM format
+
+        Returns:
+            Path of a temp file holding the validated PDF (the caller moves or
+            deletes it), or None if the candidate is not the report
+        """
+        response = await page.request.get(url, headers={'Range': f'bytes=0-{RANGE_PROBE_BYTES - 1}'})
+        if not response.ok:
+            return None
+
+        content = await response.body()
+        if not content.startswith(b'%PDF'):
+            return None
+
+        fd, tmp_path = tempfile.mkstemp(suffix='.part', dir=REPORTS_DIR)
+        os.close(fd)
+        keep = False
+        try:
+            # 206 means we only have the head; 200 means the server sent it all
+            if response.status == 206:
+                try:
+                    head_text = await asyncio.to_thread(first_page_text, content)
+                except Exception:
+                    head_text = None
+
+                # Text from a truncated PDF is often partial, so only reject
+                # on positive evidence; a missing fund name or month is left
+                # to the full validation below
+                if head_text and head_text.strip():
+                    reason = self._wrong_document_reason(head_text)
+                    if reason:
+                        print(f"  ❌ PDF invalid: {reason}")
+                        return None
+
+                # Stream the rest straight to disk with the page's cookies
+                headers = await browser_headers(page.context, url)
+                if not await stream_to_file(url, tmp_path, headers):
+                    return None
+            else:
+                with open(tmp_path, 'wb') as f:
+                    f.write(content)
+            del content
+
+            is_valid, reason = await asyncio.to_thread(self.validate_pdf_file, tmp_path, expected_month)
+            if not is_valid:
+                print(f"  ❌ PDF invalid: {reason}")
+                return None
+
+            keep = True
+            return tmp_path
+
+        finally:
+            if not keep and os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -1,190 +1,171 @@
 import asyncio
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 import os
-import sys
 import re
-import io
-from typing import Dict, Tuple
-import pdfplumber
+from urllib.parse import urljoin
+from html import unescape
 
-# Import parent directory for pdf_utils
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from .base import PdfReportExtractor
+from ._browser_pool import get_context, block_heavy_resources, wait_for_network_idle
+from ._http import USER_AGENT, browser_headers, get_session, stream_to_file
 
-from .base import BaseExtractor
-from pdf_utils.ytm_extractor import extract_ytm_from_pdf
 
+# guest_profile cookie value that bypasses the investor-profile modal
+GUEST_PROFILE = 'eyJpdiI6IkNRd3hCeFRlYTFqdXVwODc1MWd1VHc9PSIsInZhbHVlIjoiRDFhWW05UUd3dGlUT3RxblM1S1AzS0diM3IyTGNyOWJWazZXWE9iQzRPRnA1TzY1cUFEMm9WM1pvcVMyMHVXS0dXenNRNGo2V3NuekkrS0tZMzd6NWc9PSIsIm1hYyI6ImI0NWMzNTUxOTFmMjljN2ZlMDRmMDhkZTUzNzZiODRiZjA4MWQ1ZmRiZmVjZGRiMWQ3MjA0NzA1OTUyMjBlZTAiLCJ0YWciOiIifQ%3D%3D'
 
-class SycomoreExtractor(BaseExtractor):
+# Report links in the server-rendered fund page: the "Voir le dernier
+# reporting" button first, then any /telecharger/reporting/ link
+_REPORT_BUTTON_RE = re.compile(
+    r'<a\b[^>]*?href="([^"]+)"[^>]*>(?:(?!</a>).)*?Voir le dernier reporting',
+    re.IGNORECASE | re.DOTALL
+)
+_REPORTING_LINK_RE = re.compile(r'href="([^"]*/telecharger/reporting/[^"]*)"', re.IGNORECASE)
+
+
+async def _setup_context(context) -> None:
+    """One-time setup of the cached Sycomore context"""
+    await context.route("**/*", block_heavy_resources)
+
+    # Inject guest_profile cookie to bypass modal
+    print("🍪 Injecting cookie...")
+    await context.add_cookies([{
+        'name': 'guest_profile',
+        'value': GUEST_PROFILE,
+        'domain': '.sycomore-am.com',
+        'path': '/',
+        'httpOnly': False,
+        'secure': False,
+        'sameSite': 'Lax'
+    }])
+
+
+class SycomoreExtractor(PdfReportExtractor):
     """Extractor for Sycomore fund YTM data (PDF download + extraction)"""
 
-    async def extract(self, report_date: str = None) -> Dict:
+    FUND_NAME_ALIASES = ("Sycoyield",)
+
+    async def download_report(self, expected_month: str = None) -> str:
         """
-        Extract YTM data from Sycomore fund by downloading and parsing PDF
+        Download the latest monthly report PDF
 
         Args:
-            report_date: Target month (YYYY-MM-01), defaults to current month
+            expected_month: Expected month in YYYY-MM format for validation
 
         Returns:
-            Standardized result dictionary
+            Path to downloaded PDF, or None if failed
         """
-        report_date = self._get_report_date(report_date)
-        # Extract YYYY-MM for validation
-        expected_month = report_date[:7]  # "2025-12-01" -> "2025-12"
+        # Use absolute path based on this file's location
+        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        output_dir = os.path.join(base_dir, "reports")
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
 
-        try:
-            print(f"\n{'='*50}")
-            print(f"Extracting: {self.fund_name}")
-            print(f"{'='*50}")
-
-            # Step 1: Download PDF
-            print("📥 Downloading PDF report...")
-            pdf_path = await self.download_report(expected_month)
-
-            if not pdf_path:
-                return self._build_result(
-                    report_date=report_date,
-                    error="Failed to download PDF report"
-                )
-
-            # Step 2: Extract YTM from PDF
-            print("📊 Extracting YTM from PDF...")
-            pdf_result = extract_ytm_from_pdf(pdf_path, self.provider)
-
-            if pdf_result['success']:
-                ytm = pdf_result['yield_to_maturity']
-                # Use PDF-extracted date if available, otherwise use report_date
-                extracted_date = pdf_result.get('report_date') or report_date
-
-                print(f"✅ Extracted: {ytm}%")
-                return self._build_result(
-                    yield_to_maturity=ytm,
-                    report_date=extracted_date,
-                    source_document=pdf_path,
-                    success=True
-                )
-            else:
-                print(f"❌ Failed to extract YTM: {pdf_result['error']}")
-                return self._build_result(
-                    report_date=report_date,
-                    source_document=pdf_path,
-                    error=f"PDF extraction failed: {pdf_result['error']}"
-                )
+        # Use passed expected_month or calculate from current date
+        if not expected_month:
+            current_date = datetime.now()
+            expected_month = current_date.strftime('%Y-%m')
 
-        except Exception as e:
-            error = f"Unexpected error: {str(e)}"
-            print(f"❌ {error}")
-            return self._build_result(report_date=report_date, error=error)
+        timestamp = expected_month.replace('-', '')  # Use expected_month (e.g., "2025-12" → "202512")
+        safe_fund_name = self.fund_name.lower().replace(' ', '_')
+        report_filename = f"{safe_fund_name}_report_{timestamp}.pdf"
+        report_path = os.path.join(output_dir, report_filename)
+
+        # Fast path: reuse the URL that validated earlier this month
+        if await self._download_from_url_cache(expected_month, report_path):
+            return report_path
+
+        # The fund page is server-rendered, so plain HTTP usually finds the link
+        if await self._download_report_static(expected_month, report_path):
+            return report_path
 
-    def validate_pdf_content(self, content: bytes, expected_report_month: str = None) -> Tuple[bool, str]:
+        return await self._download_report_browser_fallback(expected_month, report_path)
+
+    async def _download_report_static(self, expected_month: str, report_path: str) -> str:
         """
-        Validate that downloaded PDF is the correct monthly report
+        Find and download the report without a browser
+
+        Fetches the fund page with the guest_profile cookie, pulls the report
+        link out of the HTML and streams the PDF to disk.
 
         Args:
-            content: PDF file bytes
-            expected_report_month: Expected month in format "YYYY-MM" (e.g., "2025-11")
+            expected_month: Expected month in YYYY-MM format for validation
+            report_path: Where to save the PDF
 
         Returns:
-            (is_valid, reason)
+            report_path on success, None if the browser flow is needed
         """
+        print("⚡ Trying static page fetch...")
+        headers = {
+            'User-Agent': USER_AGENT,
+            'Accept-Language': 'fr-FR,fr;q=0.9',
+            'Cookie': f'guest_profile={GUEST_PROFILE}',
+        }
+        tmp_path = report_path + '.part'
         try:
-            with pdfplumber.open(io.BytesIO(content)) as pdf:
-                first_page = pdf.pages[0].extract_text()
-
-                # Check 1: Reject KIID/DIC documents
-                if any(kw in first_page for kw in ["Document d'informations clés", "KIID", "Document d'information clé"]):
-                    return False, "PDF is a KIID/DIC, not a monthly report"
-
-                # Check 2: Extract and validate ISIN if configured
-                isin_match = re.search(r'ISIN[:\s]+([A-Z]{2}[A-Z0-9]{10})', first_page)
-
-                if self.isin_code:
-                    if isin_match:
-                        found_isin = isin_match.group(1)
-                        if found_isin != self.isin_code:
-                            return False, f"ISIN mismatch: expected {self.isin_code}, found {found_isin}"
-                    # If ISIN is configured but not found in PDF, that's okay (some monthly reports don't have ISIN)
-
-                # Check 3: Validate fund name
-                if self.fund_name not in first_page and "Sycoyield" not in first_page:
-                    return False, f"Fund name '{self.fund_name}' not found in PDF"
-
-                # Check 4: Validate report month if specified
-                if expected_report_month:
-                    year, month = expected_report_month.split('-')
-                    month_num = int(month)
-
-                    # Month names in French and English
-                    month_names = {
-                        1: ['janvier', 'january'], 2: ['février', 'february', 'fevrier'],
-                        3: ['mars', 'march'], 4: ['avril', 'april'],
-                        5: ['mai', 'may'], 6: ['juin', 'june'],
-                        7: ['juillet', 'july'], 8: ['août', 'august', 'aout'],
-                        9: ['septembre', 'september'], 10: ['octobre', 'october'],
-                        11: ['novembre', 'november'], 12: ['décembre', 'december', 'decembre']}
-
-                    expected_month_names = month_names.get(month_num, [])
-                    first_page_lower = first_page.lower()
-
-                    # Check if any expected month name is in the PDF
-                    if not any(name in first_page_lower for name in expected_month_names):
-                        return False, f"PDF doesn't contain expected month ({expected_month_names[0]} {year})"
-
-                return True, "PDF validated successfully"
+            async with get_session().get(self.url, headers=headers) as response:
+                if response.status != 200:
+                    print(f"  ⚠️  Fund page returned HTTP {response.status}")
+                    return None
+                html = await response.text()
+
+            match = _REPORT_BUTTON_RE.search(html) or _REPORTING_LINK_RE.search(html)
+            if not match:
+                print("  ⚠️  No report link in static HTML")
+                return None
+
+            report_url = urljoin(self.url, unescape(match.group(1)))
+            if not await stream_to_file(report_url, tmp_path, headers):
+                print("  ⚠️  Static report download failed")
+                return None
+
+            is_valid, reason = await asyncio.to_thread(self.validate_pdf_file, tmp_path, expected_month)
+            if not is_valid:
+                print(f"  ❌ PDF validation failed: {reason}")
+                return None
+
+            os.replace(tmp_path, report_path)
 
         except Exception as e:
-            return False, f"Validation error: {str(e)}"
+            print(f"  ⚠️  Static fetch error: {e}")
+            return None
 
-    async def download_report(self, expected_month: str = None) -> str:
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        file_size = os.path.getsize(report_path)
+        print(f"✅ PDF downloaded and validated ({file_size:,} bytes)")
+        self._remember_report_url(expected_month, report_url)
+        return report_path
+
+    async def _download_report_browser_fallback(self, expected_month: str, report_path: str) -> str:
         """
-        Download the latest monthly report PDF
+        Find and download the report by driving the fund page in Chromium
 
         Args:
             expected_month: Expected month in YYYY-MM format for validation
+            report_path: Where to save the PDF
 
         Returns:
-            Path to downloaded PDF, or None if failed
+            report_path on success, None if failed
         """
-        # Use absolute path based on this file's location
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        output_dir = os.path.join(base_dir, "reports")
-        Path(output_dir).mkdir(parents=True, exist_ok=True)
-
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(
-                    headless=True,
-                    args=['--disable-blink-features=AutomationControlled']
-                )
-
-                context = await browser.new_context(
-                    viewport={'width': 1920, 'height': 1080},
-                    locale='fr-FR',
-                    user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
-                    accept_downloads=True
-                )
-
-                # Inject guest_profile cookie to bypass modal
-                print("🍪 Injecting cookie...")
-                guest_profile_cookie = {
-                    'name': 'guest_profile',
-                    'value': 'eyJpdiI6IkNRd3hCeFRlYTFqdXVwODc1MWd1VHc9PSIsInZhbHVlIjoiRDFhWW05UUd3dGlUT3RxblM1S1AzS0diM3IyTGNyOWJWazZXWE9iQzRPRnA1TzY1cUFEMm9WM1pvcVMyMHVXS0dXenNRNGo2V3NuekkrS0tZMzd6NWc9PSIsIm1hYyI6ImI0NWMzNTUxOTFmMjljN2ZlMDRmMDhkZTUzNzZiODRiZjA4MWQ1ZmRiZmVjZGRiMWQ3MjA0NzA1OTUyMjBlZTAiLCJ0YWciOiIifQ%3D%3D',
-                    'domain': '.sycomore-am.com',
-                    'path': '/',
-                    'httpOnly': False,
-                    'secure': False,
-                    'sameSite': 'Lax'
-                }
-
-                await context.add_cookies([guest_profile_cookie])
-
-                page = await context.new_page()
-
+            context = await get_context(
+                'sycomore',
+                _setup_context,
+                viewport={'width': 1920, 'height': 1080},
+                locale='fr-FR',
+                user_agent=USER_AGENT,
+                accept_downloads=True
+            )
+
+            page = await context.new_page()
+            download_page = None
+            try:
                 # Navigate to page
                 print("📄 Loading page...")
                 await page.goto(self.url, wait_until='domcontentloaded', timeout=30000)
-                await asyncio.sleep(3)
+                await wait_for_network_idle(page, timeout=15000)
 
                 # Search for report download link
                 report_url = None
@@ -211,47 +192,34 @@ class SycomoreExtractor(BaseExtractor):
                         pass
 
                 if not report_url:
-                    await browser.close()
                     print("❌ Could not find report download link")
                     return None
 
                 # Download the PDF
                 print(f"⬇️  Downloading PDF...")
 
-                # Use passed expected_month or calculate from current date
-                if not expected_month:
-                    current_date = datetime.now()
-                    expected_month = current_date.strftime('%Y-%m')
+                # Try direct download first, streamed to a temp file with the page's cookies
+                report_url = urljoin(self.url, report_url)
+                tmp_path = report_path + '.part'
+                try:
+                    headers = await browser_headers(context, report_url)
 
-                timestamp = expected_month.replace('-', '')  # Use expected_month (e.g., "2025-12" → "202512")
-                safe_fund_name = self.fund_name.lower().replace(' ', '_')
-                report_filename = f"{safe_fund_name}_report_{timestamp}.pdf"
-                report_path = os.path.join(output_dir, report_filename)
+                    if not await stream_to_file(report_url, tmp_path, headers):
+                        raise Exception("HTTP download failed")
 
-                # Try API download first
-                try:
-                    response = await page.request.get(report_url)
-
-                    if response.ok:
-                        content = await response.body()
-
-                        if content.startswith(b'%PDF'):
-                            # Validate content before saving
-                            is_valid, reason = self.validate_pdf_content(content, expected_month)
-
-                            if is_valid:
-                                with open(report_path, 'wb') as f:
-                                    f.write(content)
-
-                                file_size = os.path.getsize(report_path)
-                                print(f"✅ PDF downloaded and validated ({file_size:,} bytes)")
-                                await browser.close()
-                                return report_path
-                            else:
-                                print(f"  ❌ PDF validation failed: {reason}")
-                                raise Exception(f"PDF validation failed: {reason}")
-                        else:
-                            raise Exception("Not a PDF")
+                    # Validate content before saving
+                    is_valid, reason = await asyncio.to_thread(self.validate_pdf_file, tmp_path, expected_month)
+
+                    if is_valid:
+                        os.replace(tmp_path, report_path)
+
+                        file_size = os.path.getsize(report_path)
+                        print(f"✅ PDF downloaded and validated ({file_size:,} bytes)")
+                        self._remember_report_url(expected_month, report_url)
+                        return report_path
+                    else:
+                        print(f"  ❌ PDF validation failed: {reason}")
+                        raise Exception(f"PDF validation failed: {reason}")
 
                 except:
                     # Try navigation download
@@ -265,29 +233,32 @@ class SycomoreExtractor(BaseExtractor):
                         await download.save_as(report_path)
 
                         # Validate the downloaded file
-                        with open(report_path, 'rb') as f:
-                            content = f.read()
-
-                        is_valid, reason = self.validate_pdf_content(content, expected_month)
+                        is_valid, reason = await asyncio.to_thread(self.validate_pdf_file, report_path, expected_month)
 
                         if is_valid:
                             file_size = os.path.getsize(report_path)
                             print(f"✅ PDF downloaded and validated ({file_size:,} bytes)")
-                            await browser.close()
+                            self._remember_report_url(expected_month, report_url)
                             return report_path
                         else:
                             print(f"  ❌ PDF validation failed: {reason}")
                             # Delete invalid PDF
                             os.remove(report_path)
-                            await browser.close()
                             return None
 
                     except Exception as e:
                         print(f"❌ Download failed: {e}")
-                        await browser.close()
                         return None
 
-                await browser.close()
+                finally:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+
+            finally:
+                # Only the pages are ours; the cached context stays up
+                await page.close()
+                if download_page:
+                    await download_page.close()
 
         except Exception as e:
             print(f"❌ Error downloading report: {str(e)}")
@@ -4,28 +4,28 @@ YTM Data Extraction - Main Orchestrator
 
 Extracts Yield-to-Maturity data from all configured funds and stores in SQLite.
 
-Usage:
-    python main.py                    # Extract current month data
-    python main.py --date 2024-11     # Extract specific month
-    python main.py --fund carmignac_2027  # Extract single fund
-    python main.py --dry-run          # Test without saving to DB
+Usage (from the repository root):
+    python -m ytm_dashboard                        # Extract current month data
+    python -m ytm_dashboard --date 2024-11         # Extract specific month
+    python -m ytm_dashboard --fund carmignac_2027  # Extract single fund
+    python -m ytm_dashboard --dry-run              # Test without saving to DB
 """
 
 import asyncio
 import argparse
 from datetime import datetime
 import sys
-import os
 
-# Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
-from database import DatabaseManager
-from extractors.carmignac import CarmignacExtractor
-from extractors.sycomore import SycomoreExtractor
-from extractors.rothschild import RothschildExtractor
-from config import FUND_CONFIG
-from dashboard import generate_all_dashboards, generate_latest_dashboard
+from .database import DatabaseManager
+from .extractors.carmignac import CarmignacExtractor
+from .extractors.sycomore import SycomoreExtractor
+from .extractors.rothschild import RothschildExtractor
+from .extractors.base import run_all
+from .extractors._browser_pool import close_browser
+from .extractors._http import close_session
+from .extractors._cache import flush_caches
+from .config import FUND_CONFIG, FUND_CONFIG_WITH_ID
+from .dashboard import generate_all_dashboards
 
 
 EXTRACTOR_MAP = {
@@ -35,7 +35,8 @@ EXTRACTOR_MAP = {
 }
 
 
-async def extract_all_funds(report_date: str, fund_filter: str = None, dry_run: bool = False) -> tuple:
+async def extract_all_funds(report_date: str, fund_filter: str = None, dry_run: bool = False,
+                            force: bool = False) -> tuple:
     """
     Extract YTM data for all configured funds
 
@@ -43,6 +44,7 @@ async def extract_all_funds(report_date: str, fund_filter: str = None, dry_run:
         report_date: Target report date (YYYY-MM-01)
         fund_filter: Optional fund ID to extract only one fund
         dry_run: If True, don't save to database
+        force: If True, re-download reports already saved on disk
 
     Returns:
         List of extraction results
@@ -54,13 +56,11 @@ async def extract_all_funds(report_date: str, fund_filter: str = None, dry_run:
     else:
         print("\n🔍 DRY RUN MODE - No data will be saved to database\n")
 
-    results = []
-
     # Filter funds if requested
-    funds_to_process = FUND_CONFIG
+    funds_to_process = FUND_CONFIG_WITH_ID
     if fund_filter:
-        if fund_filter in FUND_CONFIG:
-            funds_to_process = {fund_filter: FUND_CONFIG[fund_filter]}
+        if fund_filter in FUND_CONFIG_WITH_ID:
+            funds_to_process = {fund_filter: FUND_CONFIG_WITH_ID[fund_filter]}
         else:
             print(f"❌ Fund '{fund_filter}' not found in configuration")
             return []
@@ -72,33 +72,37 @@ async def extract_all_funds(report_date: str, fund_filter: str = None, dry_run:
     print(f"Funds to process: {len(funds_to_process)}")
     print("="*60)
 
-    # Process each fund
-    for fund_id, config in funds_to_process.items():
-        # Add fund_id to config
-        config_with_id = config.copy()
-        config_with_id['fund_id'] = fund_id
-
-        # Get appropriate extractor
-        extractor_class = EXTRACTOR_MAP[config['provider']]
-        extractor = extractor_class(config_with_id)
+    # Build one extractor per fund
+    extractors = [
+        EXTRACTOR_MAP[config['provider']](config)
+        for config in funds_to_process.values()
+    ]
 
-        try:
-            result = await extractor.extract(report_date)
-            results.append(result)
-
-            # Save to database if successful and not dry run
-            if result['success'] and not dry_run:
-                db.insert_ytm_record(result)
-                print(f"💾 Saved to database")
-
-        except Exception as e:
-            print(f"❌ Error: {e}")
-            results.append({
-                'fund_id': fund_id,
-                'fund_name': config.get('fund_name'),
-                'success': False,
-                'error': str(e)
-            })
+    # Run them concurrently; wall time is the slowest fund, not the sum
+    try:
+        results = await run_all(extractors, report_date, force=force)
+    finally:
+        # Release the shared Chromium instance and HTTP session, and write
+        # the report URL and validation caches once for the whole run
+        await close_browser()
+        await close_session()
+        flush_caches()
+
+    # Save successful extractions with one statement and a single commit
+    if not dry_run:
+        successful = [r for r in results if r.get('success')]
+        if successful:
+            saved = db.insert_ytm_records(successful)
+            if saved == 0:
+                # The batch is all-or-nothing: retry one row at a time so a
+                # single bad record doesn't discard every other fund's result
+                print("⚠️  Batch insert failed, saving records one by one...")
+                for r in successful:
+                    if db.insert_ytm_record(r):
+                        saved += 1
+                    else:
+                        print(f"  ❌ Could not save {r.get('fund_id')} ({r.get('report_date')})")
+            print(f"\n💾 Saved {saved}/{len(successful)} records to database")
 
     # Print summary
     print_summary(results)
@@ -108,9 +112,12 @@ async def extract_all_funds(report_date: str, fund_filter: str = None, dry_run:
 
 def print_summary(results):
     """Print extraction summary"""
-    print("\n" + "="*60)
-    print("EXTRACTION SUMMARY")
-    print("="*60)
+    lines = [
+        "",
+        "="*60,
+        "EXTRACTION SUMMARY",
+        "="*60,
+    ]
 
     success_count = sum(1 for r in results if r.get('success'))
 
@@ -118,11 +125,15 @@ def print_summary(results):
         status = "✅" if r.get('success') else "❌"
         ytm = f"{r.get('yield_to_maturity')}%" if r.get('yield_to_maturity') else "N/A"
         fund_name = r.get('fund_name', r.get('fund_id', 'unknown'))
-        print(f"{status} {fund_name:30s} {ytm:>7s}")
+        lines.append(f"{status} {fund_name:30s} {ytm:>7s}")
         if r.get('error'):
-            print(f"    Error: {r['error']}")
+            lines.append(f"    Error: {r['error']}")
+
+    lines.append(f"\n📊 Success rate: {success_count}/{len(results)}")
 
-    print(f"\n📊 Success rate: {success_count}/{len(results)}")
+    # Written in one go rather than a print() per line
+    sys.stdout.write('\n'.join(lines) + '\n')
+    sys.stdout.flush()
 
 
 def main():
@@ -132,10 +143,10 @@ def main():
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
-  python main.py                      # Extract current month for all funds
-  python main.py --date 2024-11       # Extract November 2024 data
-  python main.py --fund carmignac_2027 # Extract only Carmignac 2027
-  python main.py --dry-run            # Test without saving
+  python -m ytm_dashboard                        # Extract current month for all funds
+  python -m ytm_dashboard --date 2024-11         # Extract November 2024 data
+  python -m ytm_dashboard --fund carmignac_2027  # Extract only Carmignac 2027
+  python -m ytm_dashboard --dry-run              # Test without saving
         """
     )
 
@@ -157,6 +168,12 @@ Examples:
         help='Test without saving to database'
     )
 
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Re-download reports even if already saved for this month'
+    )
+
     parser.add_argument(
         '--list-funds',
         action='store_true',
@@ -169,6 +186,12 @@ Examples:
         help='Skip automatic dashboard generation after extraction'
     )
 
+    parser.add_argument(
+        '--force-dashboard',
+        action='store_true',
+        help='Regenerate every monthly dashboard, not only the stale ones'
+    )
+
     args = parser.parse_args()
 
     # List funds if requested
@@ -199,7 +222,8 @@ Examples:
         results, report_date = asyncio.run(extract_all_funds(
             report_date=report_date,
             fund_filter=args.fund,
-            dry_run=args.dry_run
+            dry_run=args.dry_run,
+            force=args.force
         ))
 
         # Check if any extractions succeeded
@@ -212,13 +236,11 @@ Examples:
             print("="*60)
 
             try:
-                # Determine which dashboards to regenerate
-                if args.fund:
-                    # Single fund: just regenerate latest index.html
-                    dashboard_success = generate_latest_dashboard(quiet=False)
-                else:
-                    # All funds: regenerate all historical dashboards + index
-                    dashboard_success = generate_all_dashboards(quiet=False)
+                # Only months with new extractions (plus index.html) are
+                # rebuilt, unless --force-dashboard asks for all of them
+                dashboard_success = generate_all_dashboards(
+                    quiet=False, force=args.force_dashboard
+                )
 
                 if dashboard_success:
                     print("\n🌐 Dashboards updated successfully")
@@ -1,16 +1,124 @@
 import pdfplumber
+import fitz
+import os
 import re
-from typing import Dict, Optional
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
 from datetime import datetime
 
 
-def extract_ytm_from_pdf(pdf_path: str, provider: str) -> Dict:
+# Text backend per provider. 'pymupdf' is much faster; providers whose YTM
+# pattern depends on pdfplumber's layout reconstruction stay on 'pdfplumber'.
+# If the fast backend's text yields no YTM match, pdfplumber is tried too.
+TEXT_BACKENDS = {
+    'sycomore': 'pymupdf',
+    'rothschild': 'pymupdf',
+}
+
+
+# The YTM sits in the first pages of every report; pages past this are
+# never decoded
+MAX_PAGES = 3
+
+# YTM patterns per provider, tried in order (case-insensitive)
+YTM_PATTERNS = {
+    'sycomore': [
+        r"Rendement\s+(?:à|a)\s+maturit[ée]\**\s*([\d]+[,\.][\d]+)\s*%",
+        r"YTM\s*[:\s]+([\d]+[,\.][\d]+)\s*%"
+    ],
+    'rothschild': [
+        r"(?:Taux\s+actuariel|YTW)\s+EUR\s+([\d]+[,\.][\d]+)",
+        r"(?:Yield\s+to\s+[Mm]aturity|YTM)\s*[:\s]+([\d]+[,\.][\d]+)\s*%",
+        r"Rendement\s+(?:actuariel|à\s+maturité)\s*[:\s]+([\d]+[,\.][\d]+)\s*%"
+    ]
+}
+
+# Date patterns to extract report date (case-sensitive)
+DATE_PATTERNS = [
+    r"(?:au|as\s+of|date)\s*[:\s]*(\d{1,2})[\/\-\.](\d{1,2})[\/\-\.](\d{4})",
+    r"(\d{1,2})[\/\-\.](\d{1,2})[\/\-\.](\d{4})",
+    r"(?:Novembre|November|Décembre|December)\s+(\d{4})",
+]
+
+# Each provider's YTM patterns fused into one alternation, so the text is
+# scanned once. Every pattern has exactly one capture group, so group i
+# belongs to pattern i - 1 and match.lastindex tells which one matched.
+_FUSED_YTM_PATTERNS = {
+    provider: re.compile('|'.join(f'(?:{pattern})' for pattern in provider_patterns), re.IGNORECASE)
+    for provider, provider_patterns in YTM_PATTERNS.items()
+}
+
+# Compiled once at import rather than looked up in re's cache on every call
+_COMPILED_DATE_PATTERNS = [re.compile(pattern) for pattern in DATE_PATTERNS]
+
+# Report month encoded in downloaded file names, e.g. "..._report_202511.pdf"
+_FILENAME_DATE_RE = re.compile(r'(\d{6})\.pdf$')
+
+
+def _search_ytm(regex: re.Pattern, text: str) -> Optional[re.Match]:
+    """
+    Find the YTM match of the highest-priority pattern in a single scan
+
+    Patterns earlier in YTM_PATTERNS win over later ones wherever they
+    appear, as when they were searched one after the other.
+
+    Args:
+        regex: Fused pattern from _FUSED_YTM_PATTERNS
+        text: Text to search
+
+    Returns:
+        Best match (the value is match.group(match.lastindex)), or None
+    """
+    best = None
+    for match in regex.finditer(text):
+        if best is None or match.lastindex < best.lastindex:
+            best = match
+            if best.lastindex == 1:
+                break
+    return best
+
+
+def _page_texts(pdf_path: str, backend: str) -> Tuple[str, ...]:
+    """
+    Text of the first MAX_PAGES pages, skipping pages without text
+
+    Decoded once per file version and backend: later calls for the same
+    unchanged file (e.g. another provider) reuse the cached pages instead of reopening the PDF.
+
+    Args:
+        pdf_path: Path to the PDF file
+        backend: 'pymupdf' or 'pdfplumber'
+
+    Returns:
+        Page texts, in page order
+    """
+    return _page_texts_cached(pdf_path, os.path.getmtime(pdf_path), backend)
+
+
+@lru_cache(maxsize=32)
+def _page_texts_cached(pdf_path: str, mtime: float, backend: str) -> Tuple[str, ...]:
+    """Memoized body of _page_texts(); mtime is only part of the cache key"""
+    if backend == 'pymupdf':
+        with fitz.open(pdf_path) as doc:
+            pages = [page.get_text("text") for page in doc.pages(0, min(MAX_PAGES, doc.page_count))]
+    else:
+        with pdfplumber.open(pdf_path) as pdf:
+            pages = [page.extract_text() for page in pdf.pages[:MAX_PAGES]]
+    return tuple(page_text for page_text in pages if page_text)
+
+
+def extract_ytm_from_pdf(pdf_path: str, provider: str, backend: str = None) -> Dict:
     """
     Extract YTM from PDF report
 
+    Results are memoized per (path, modification time, provider, backend),
+    so re-reading an unchanged report is free and a re-downloaded one is
+    parsed again.
+
     Args:
         pdf_path: Path to the PDF file
         provider: Provider name ('sycomore' or 'rothschild')
+        backend: Text backend ('pymupdf' or 'pdfplumber'), defaults to TEXT_BACKENDS
 
     Returns:
         {
@@ -21,26 +129,24 @@ def extract_ytm_from_pdf(pdf_path: str, provider: str) -> Dict:
             'error': str or None
         }
     """
-    # Define patterns for each provider
-    patterns = {
-        'sycomore': [
-            r"Rendement\s+(?:à|a)\s+maturit[ée]\**\s*([\d]+[,\.][\d]+)\s*%",
-            r"YTM\s*[:\s]+([\d]+[,\.][\d]+)\s*%"
-        ],
-        'rothschild': [
-            r"(?:Taux\s+actuariel|YTW)\s+EUR\s+([\d]+[,\.][\d]+)",
-            r"(?:Yield\s+to\s+[Mm]aturity|YTM)\s*[:\s]+([\d]+[,\.][\d]+)\s*%",
-            r"Rendement\s+(?:actuariel|à\s+maturité)\s*[:\s]+([\d]+[,\.][\d]+)\s*%"
-        ]
-    }
+    try:
+        mtime = os.path.getmtime(pdf_path)
+    except OSError:
+        # Let the extraction report the missing file
+        return _extract_ytm(pdf_path, provider, backend)
 
-    # Date patterns to extract report date
-    date_patterns = [
-        r"(?:au|as\s+of|date)\s*[:\s]*(\d{1,2})[\/\-\.](\d{1,2})[\/\-\.](\d{4})",
-        r"(\d{1,2})[\/\-\.](\d{1,2})[\/\-\.](\d{4})",
-        r"(?:Novembre|November|Décembre|December)\s+(\d{4})",
-    ]
+    # Each caller gets its own dict; the cached value is an immutable tuple
+    return dict(_extract_ytm_cached(pdf_path, mtime, provider, backend))
+
+
+@lru_cache(maxsize=256)
+def _extract_ytm_cached(pdf_path: str, mtime: float, provider: str, backend: str) -> tuple:
+    """Memoized _extract_ytm(); mtime is only part of the cache key"""
+    return tuple(_extract_ytm(pdf_path, provider, backend).items())
 
+
+def _extract_ytm(pdf_path: str, provider: str, backend: str = None) -> Dict:
+    """Uncached implementation of extract_ytm_from_pdf()"""
     result = {
         'yield_to_maturity': None,
         'report_date': None,
@@ -50,26 +156,34 @@ def extract_ytm_from_pdf(pdf_path: str, provider: str) -> Dict:
     }
 
     try:
-        # Extract text from all pages
-        full_text = ""
-        with pdfplumber.open(pdf_path) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    full_text += page_text + "\n"
-
-        if not full_text:
-            result['error'] = "No text extracted from PDF"
-            return result
+        if backend is None:
+            backend = TEXT_BACKENDS.get(provider.lower(), 'pdfplumber')
+        backends = [backend] if backend == 'pdfplumber' else [backend, 'pdfplumber']
 
-        # Search for YTM patterns
-        provider_patterns = patterns.get(provider.lower(), [])
+        ytm_regex = _FUSED_YTM_PATTERNS.get(provider.lower())
         ytm_found = False
+        any_text = False
+
+        for text_backend in backends:
+            # Search page by page: the YTM is usually on page 1 or 2, so the
+            # remaining pages are not scanned once it is found
+            pages_text = []
+            match = None
+            for page_text in _page_texts(pdf_path, text_backend):
+                pages_text.append(page_text)
+                page_match = _search_ytm(ytm_regex, page_text) if ytm_regex else None
+                # Keep looking only while a higher-priority pattern may follow
+                if page_match and (match is None or page_match.lastindex < match.lastindex):
+                    match = page_match
+                    if match.lastindex == 1:
+                        break
+
+            if not pages_text:
+                continue
+            any_text = True
 
-        for pattern in provider_patterns:
-            match = re.search(pattern, full_text, re.IGNORECASE)
             if match:
-                ytm_str = match.group(1)
+                ytm_str = match.group(match.lastindex)
                 result['raw_text_match'] = match.group(0)
 
                 # Convert French number format (comma) to decimal (period)
@@ -78,26 +192,33 @@ def extract_ytm_from_pdf(pdf_path: str, provider: str) -> Dict:
                 try:
                     result['yield_to_maturity'] = float(ytm_str)
                     ytm_found = True
-                    break
                 except ValueError:
                     result['error'] = f"Could not convert YTM value: {ytm_str}"
                     return result
 
+            if ytm_found:
+                break
+
+        if not any_text:
+            result['error'] = "No text extracted from PDF"
+            return result
+
         if not ytm_found:
             result['error'] = f"YTM not found in PDF for provider: {provider}"
             return result
 
         # Try to extract report date from filename first
-        filename_date_match = re.search(r'(\d{6})\.pdf$', pdf_path)
+        filename_date_match = _FILENAME_DATE_RE.search(pdf_path)
         if filename_date_match:
             date_str = filename_date_match.group(1)  # Format: YYYYMM
             year = date_str[:4]
             month = date_str[4:6]
             result['report_date'] = f"{year}-{month}-01"
         else:
-            # Try to extract from PDF content
-            for pattern in date_patterns:
-                match = re.search(pattern, full_text)
+            # Try to extract from the pages read so far
+            full_text = "\n".join(pages_text)
+            for regex in _COMPILED_DATE_PATTERNS:
+                match = regex.search(full_text)
                 if match:
                     # Handle different date formats
                     if len(match.groups()) == 3:
@@ -141,7 +262,6 @@ def parse_french_number(number_str: str) -> float:
 if __name__ == "__main__":
     # Test with existing PDFs
     import sys
-    import os
 
     print("Testing PDF YTM Extractor...\n")
 
@@ -4,12 +4,12 @@ Test Carmignac PDF-based extraction
 """
 
 import asyncio
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from extractors.carmignac import CarmignacExtractor
-from config import FUND_CONFIG
+from .extractors.base import run_all
+from .extractors.carmignac import CarmignacExtractor
+from .extractors._browser_pool import close_browser
+from .extractors._http import close_session
+from .config import FUND_CONFIG_WITH_ID
 
 async def test_carmignac_extraction():
     """Test Carmignac PDF extraction for all 3 funds"""
@@ -24,23 +24,21 @@ async def test_carmignac_extraction():
     print("=" * 60 + "\n")
 
     carmignac_funds = {
-        'carmignac_2027': FUND_CONFIG['carmignac_2027'],
-        'carmignac_2029': FUND_CONFIG['carmignac_2029'],
-        'carmignac_2031': FUND_CONFIG['carmignac_2031'],
+        'carmignac_2027': FUND_CONFIG_WITH_ID['carmignac_2027'],
+        'carmignac_2029': FUND_CONFIG_WITH_ID['carmignac_2029'],
+        'carmignac_2031': FUND_CONFIG_WITH_ID['carmignac_2031'],
     }
 
-    results = []
+    extractors = [CarmignacExtractor(fund_config) for fund_config in carmignac_funds.values()]
 
-    for fund_id, fund_config in carmignac_funds.items():
-        # Add fund_id to config
-        config_with_id = fund_config.copy()
-        config_with_id['fund_id'] = fund_id
-
-        extractor = CarmignacExtractor(config_with_id)
-
-        result = await extractor.extract(report_date)
-        results.append(result)
+    # Run all three at once, then report in fund order
+    try:
+        results = await run_all(extractors, report_date, max_per_provider=len(extractors))
+    finally:
+        await close_browser()
+        await close_session()
 
+    for fund_config, result in zip(carmignac_funds.values(), results):
         print(f"\nResult for {fund_config['fund_name']}:")
         print(f"  Success: {result['success']}")
         if result['success']:
@@ -1,62 +1,64 @@
 #!/usr/bin/env python3
 """
 Simple database viewer
-Usage: python3 view_database.py
+Usage: python3 -m ytm_dashboard.view_database
 """
 
 import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from itertools import chain
 
-from database import DatabaseManager
+from .database import DatabaseManager
+
+# Row templates, filled with str.format_map(record)
+HISTORY_ROW = "{report_date:12s} {fund_name:30s} {yield_to_maturity:>6.2f}% {source_type:8s}\n"
+LATEST_ROW = "{fund_name:30s} {fund_maturity}    {yield_to_maturity:>6.2f}% {report_date}\n"
 
 def main():
     db = DatabaseManager('data/ytm_data.db')
 
-    print("\n" + "="*80)
-    print("YTM DATABASE VIEWER")
-    print("="*80)
-
-    # Get all records
-    all_records = db.get_all_records()
+    out = sys.stdout
+    out.write("\n" + "="*80 + "\nYTM DATABASE VIEWER\n" + "="*80 + "\n")
 
-    print(f"\nTotal records: {len(all_records)}")
+    # Stream records instead of loading the whole table
+    records = db.iter_all_records()
+    first = next(records, None)
 
-    if not all_records:
-        print("\nDatabase is empty. Run 'python3 main.py' to extract data.")
+    if first is None:
+        out.write("\nTotal records: 0\n"
+                  "\nDatabase is empty. Run 'python3 -m ytm_dashboard' to extract data.\n")
+        out.flush()
         return
 
-    # Show latest records for each fund
-    print("\n" + "-"*80)
-    print("LATEST YTM VALUES")
-    print("-"*80)
-
-    latest = db.get_latest_records()
+    # Show all records by date, noting each fund's latest record on the way
+    out.write("\n" + "-"*80 + "\nALL RECORDS (by date)\n" + "-"*80 + "\n"
+              f"\n{'Date':12s} {'Fund Name':30s} {'YTM':>7s} {'Source':8s}\n"
+              + "-"*80 + "\n")
 
-    print(f"\n{'Fund Name':30s} {'Maturity'} {'YTM':>7s} {'Report Date':12s}")
-    print("-"*80)
+    total = 0
+    latest_by_fund = {}
 
-    for record in latest:
-        print(f"{record['fund_name']:30s} "
-              f"{record['fund_maturity']}    "
-              f"{record['yield_to_maturity']:>6.2f}% "
-              f"{record['report_date']}")
+    def history_lines():
+        nonlocal total
+        for record in chain([first], records):
+            total += 1
+            # Records come newest first, so the first one per fund is its latest
+            latest_by_fund.setdefault(record['fund_id'], record)
+            yield HISTORY_ROW.format_map(record)
 
-    # Show all records by date
-    print("\n" + "-"*80)
-    print("ALL RECORDS (by date)")
-    print("-"*80)
+    # One writelines() call instead of a print() per row
+    out.writelines(history_lines())
 
-    print(f"\n{'Date':12s} {'Fund Name':30s} {'YTM':>7s} {'Source':8s}")
-    print("-"*80)
-
-    for record in all_records:
-        print(f"{record['report_date']:12s} "
-              f"{record['fund_name']:30s} "
-              f"{record['yield_to_maturity']:>6.2f}% "
-              f"{record['source_type']:8s}")
-
-    print("\n" + "="*80 + "\n")
+    # Show latest records for each fund
+    latest = sorted(latest_by_fund.values(),
+                    key=lambda r: (r['fund_maturity'], r['fund_name']))
+
+    out.write("\n" + "-"*80 + "\nLATEST YTM VALUES\n" + "-"*80 + "\n"
+              f"\n{'Fund Name':30s} {'Maturity'} {'YTM':>7s} {'Report Date':12s}\n"
+              + "-"*80 + "\n"
+              + ''.join(LATEST_ROW.format_map(record) for record in latest)
+              + f"\nTotal records: {total}\n"
+              + "\n" + "="*80 + "\n\n")
+    out.flush()
 
 if __name__ == "__main__":
     main()